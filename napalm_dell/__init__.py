@@ -1,14 +1,57 @@
 """napalm_dell package."""
 
 # Import stdlib
-import pkg_resources
+import sys
 
-# Import local modules
-from napalm_dell.dell import DNOS6Driver
+__all__ = ('DNOS6Driver', )
+if sys.version_info >= (3, 5):
+    __all__ += ('AsyncDNOS6Driver', )
 
-try:
-    __version__ = pkg_resources.get_distribution('napalm-dell').version
-except pkg_resources.DistributionNotFound:
-    __version__ = "Not installed"
 
-__all__ = ('DNOS6Driver', )
+def _get_version():
+    try:
+        from importlib import metadata
+    except ImportError:
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            metadata = None
+    if metadata is not None:
+        try:
+            return metadata.version('napalm-dell')
+        except metadata.PackageNotFoundError:
+            return "Not installed"
+    import pkg_resources
+    try:
+        return pkg_resources.get_distribution('napalm-dell').version
+    except pkg_resources.DistributionNotFound:
+        return "Not installed"
+
+
+if sys.version_info >= (3, 7):
+    # The drivers pull in napalm, netmiko and paramiko, load them on first
+    # access so that e.g. napalm_dell.parsers imports quickly.
+    _LAZY = {
+        'DNOS6Driver': 'napalm_dell.dell',
+        'AsyncDNOS6Driver': 'napalm_dell.dell_async',
+    }
+
+    def __getattr__(name):
+        if name == '__version__':
+            value = _get_version()
+        elif name in _LAZY:
+            import importlib
+            value = getattr(importlib.import_module(_LAZY[name]), name)
+        else:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(__name__, name))
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY) | {'__version__'})
+else:
+    from napalm_dell.dell import DNOS6Driver
+    if sys.version_info >= (3, 5):
+        from napalm_dell.dell_async import AsyncDNOS6Driver
+    __version__ = _get_version()
@@ -0,0 +1,197 @@
+"""Benchmark of the getter parsers on captured and synthetic outputs.
+
+Run with ``python -m napalm_dell.benchmark``, e.g.::
+
+    python -m napalm_dell.benchmark --members 1,8,12 --macs 100000 --arps 20000
+
+For every getter and data set it reports the number of entries, the best
+parse time out of --repeat runs, entries per second and the peak memory
+allocated while parsing.
+
+``--imports`` instead measures the import time of the modules usable
+without a device connection, and fails if one exceeds --import-budget::
+
+    python -m napalm_dell.benchmark --imports --import-budget 0.1
+
+The driver modules, which load napalm, netmiko and paramiko, are measured
+as well against the larger --driver-import-budget.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+from napalm_dell import parsers
+from napalm_dell import synthetic
+from napalm_dell.replay import DEFAULT_REPLAY_DIR
+
+
+def _count(result):
+    if isinstance(result, dict):
+        return sum(len(v) for v in result.values())
+    return len(result)
+
+
+# getter -> (commands, parse function taking the outputs in that order)
+GETTERS = [
+    ('get_interfaces', ('show running-config', 'show interfaces'),
+     parsers.parse_interfaces),
+    ('get_mac_address_table', ('show mac address-table', ),
+     lambda output: list(parsers.iter_mac_address_table(output))),
+    ('get_arp_table', ('show arp', ),
+     lambda output: list(parsers.iter_arp_table(output))),
+    ('get_lldp_neighbors', ('show lldp remote-device all', ),
+     parsers.parse_lldp_neighbors),
+]
+
+
+def example_outputs(path=DEFAULT_REPLAY_DIR):
+    """Return the captures of the example_output directory as command -> output."""
+    outputs = {}
+    for fname in os.listdir(path):
+        with io.open(os.path.join(path, fname), 'rt', encoding='utf-8') as fobj:
+            output = fobj.read()
+        first, _, rest = output.partition('\n')
+        if first.startswith('show '):
+            outputs[first.strip()] = rest
+        else:
+            outputs[os.path.splitext(fname)[0].replace('_', ' ')] = output
+    # 'show interfaces' is usable without a running-config
+    outputs.setdefault('show running-config', '')
+    return outputs
+
+
+def measure(parse, args, repeat=3, memory=True):
+    """Return (entries, best time in seconds, peak bytes or None) of parse(*args)."""
+    timer = timeit.Timer(lambda: parse(*args))
+    best = min(timer.repeat(repeat=repeat, number=1))
+    entries = _count(parse(*args))
+    peak = None
+    if memory:
+        tracemalloc.start()
+        parse(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return entries, best, peak
+
+
+def run(datasets, repeat=3, memory=True):
+    """Benchmark all getters on datasets, a list of (name, outputs) tuples.
+
+    Yields one dict per getter and data set.
+    """
+    for name, outputs in datasets:
+        for getter, commands, parse in GETTERS:
+            if not all(c in outputs for c in commands):
+                continue
+            args = [outputs[c] for c in commands]
+            entries, best, peak = measure(parse, args, repeat, memory)
+            yield {
+                'dataset': name,
+                'getter': getter,
+                'entries': entries,
+                'seconds': best,
+                'entries_per_second': entries / best if best else float('inf'),
+                'peak_bytes': peak,
+            }
+
+
+# Modules which must import without napalm, netmiko and paramiko
+IMPORT_MODULES = ('napalm_dell', 'napalm_dell.parsers', 'napalm_dell.compact',
+                  'napalm_dell.locator', 'napalm_dell.replay')
+# Seconds above the startup of a bare interpreter
+IMPORT_BUDGET = 0.1
+# Modules which need napalm, netmiko and paramiko
+DRIVER_IMPORT_MODULES = ('napalm_dell.dell', 'napalm_dell.fleet')
+DRIVER_IMPORT_BUDGET = 1.0
+
+
+def import_time(module, repeat=5):
+    """Return the best time of importing module in a fresh interpreter.
+
+    The startup time of the interpreter itself is subtracted.
+    """
+    def best(code):
+        timer = timeit.Timer(
+            lambda: subprocess.check_call([sys.executable, '-c', code]))
+        return min(timer.repeat(repeat=repeat, number=1))
+    return max(best('import %s' % module) - best('pass'), 0.0)
+
+
+def check_imports(modules=IMPORT_MODULES, budget=IMPORT_BUDGET, repeat=5):
+    """Print the import time of modules, return False if one is over budget."""
+    ok = True
+    print('%-24s %11s' % ('module', 'import ms'))
+    for module in modules:
+        seconds = import_time(module, repeat)
+        over = seconds > budget
+        ok = ok and not over
+        print('%-24s %11.1f%s' % (module, seconds * 1000,
+                                   '  over budget' if over else ''))
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the napalm-dell output parsers.')
+    parser.add_argument('--members', default='1,4,8,12',
+                        help='comma separated stack sizes to synthesize')
+    parser.add_argument('--macs', type=int, default=100000,
+                        help='MAC table entries per synthetic data set')
+    parser.add_argument('--arps', type=int, default=20000,
+                        help='ARP table entries per synthetic data set')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the tracemalloc peak memory measurement')
+    parser.add_argument('--imports', action='store_true',
+                        help='measure module import times instead')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help='seconds a module import may take')
+    parser.add_argument('--driver-import-budget', type=float,
+                        default=DRIVER_IMPORT_BUDGET,
+                        help='seconds a driver module import may take')
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        ok = check_imports(budget=args.import_budget, repeat=args.repeat)
+        ok = check_imports(DRIVER_IMPORT_MODULES, args.driver_import_budget,
+                           args.repeat) and ok
+        return 0 if ok else 1
+
+    datasets = [('example_output', example_outputs())]
+    for members in args.members.split(','):
+        members = int(members)
+        datasets.append(('%d members' % members,
+                         synthetic.outputs(members, args.macs, args.arps)))
+
+    print('%-16s %-22s %9s %11s %14s %11s' % (
+        'dataset', 'getter', 'entries', 'parse ms', 'entries/s', 'peak KiB'))
+    for r in run(datasets, args.repeat, not args.no_memory):
+        peak = '-' if r['peak_bytes'] is None else '%d' % (r['peak_bytes'] // 1024)
+        print('%-16s %-22s %9d %11.2f %14.0f %11s' % (
+            r['dataset'], r['getter'], r['entries'], r['seconds'] * 1000,
+            r['entries_per_second'], peak))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
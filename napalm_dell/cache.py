@@ -0,0 +1,63 @@
+"""Command output cache used by the DNOS6 driver."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import collections
+import threading
+import time
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class CommandCache(object):
+    """Bounded mapping of command -> output whose entries expire after ``ttl`` seconds.
+
+    The least recently used entry is evicted once ``size`` entries are stored.
+    """
+
+    def __init__(self, ttl=60, size=32):
+        self.ttl = ttl
+        self.size = size
+        self._entries = collections.OrderedDict()
+        # getters may run concurrently on a session pool
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, command):
+        """Return the cached output for command, or None if missing or expired."""
+        with self._lock:
+            try:
+                stored, output = self._entries.pop(command)
+            except KeyError:
+                return None
+            if _clock() - stored > self.ttl:
+                return None
+            # re-insert to mark as most recently used
+            self._entries[command] = (stored, output)
+            return output
+
+    def put(self, command, output):
+        with self._lock:
+            self._entries.pop(command, None)
+            self._entries[command] = (_clock(), output)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
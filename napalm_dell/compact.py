@@ -0,0 +1,196 @@
+"""Columnar, memory efficient representation of the MAC address table.
+
+CompactMacTable stores one entry of get_mac_address_table in a few bytes:
+VLANs in an unsigned short array, MAC addresses as 48-bit integers,
+interfaces as indexes into a table of interned names and the static/active
+flags as bitsets. Iterating it yields the usual NAPALM dictionaries, with
+moves and last_move set to -1 and -1.0 as the table keeps no move history.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import struct
+from array import array
+
+from napalm_dell import parsers
+
+try:
+    array('Q')
+    _MAC_TYPECODE = 'Q'
+except ValueError:
+    # Python 2 has no 'Q', 'L' is 64 bit on LP64 platforms
+    _MAC_TYPECODE = 'L'
+
+# magic, version, entries, interfaces, length of the interface table
+_HEADER = struct.Struct('<4sHIII')
+_MAGIC = b'DNMT'
+_VERSION = 1
+
+
+def _tobytes(column):
+    if hasattr(column, 'tobytes'):
+        return column.tobytes()
+    return column.tostring()
+
+
+def _frombytes(column, data):
+    if hasattr(column, 'frombytes'):
+        column.frombytes(data)
+    else:
+        column.fromstring(data)
+
+
+def mac_to_int(mac):
+    """Convert 'F48E.3841.9628', 'F4:8E:38:41:96:28' etc. to an integer."""
+    return int(mac.replace('.', '').replace(':', '').replace('-', ''), 16)
+
+
+def int_to_mac(value):
+    """Convert an integer to the NAPALM MAC format 'F4:8E:38:41:96:28'."""
+    mac = '%012X' % value
+    return ':'.join((mac[0:2], mac[2:4], mac[4:6],
+                     mac[6:8], mac[8:10], mac[10:12]))
+
+
+class CompactMacTable(object):
+    """Columnar MAC address table, see the module documentation."""
+
+    def __init__(self):
+        self.vlans = array('H')
+        self.macs = array(_MAC_TYPECODE)
+        self.ports = array('H')
+        self.interfaces = []
+        self._interface_index = {}
+        self._static = bytearray()
+        self._active = bytearray()
+
+    @classmethod
+    def from_output(cls, output, canonical_int=None):
+        """Build the table from 'show mac address-table' output."""
+        table = cls()
+        append = table.append
+        for vlan, mac, mac_type, interface in parsers.iter_mac_address_rows(output):
+            mac_type = mac_type.lower()
+            if canonical_int is not None:
+                interface = canonical_int(interface)
+            append(int(vlan), mac_to_int(mac), interface,
+                   mac_type in ('management', 'static'),
+                   mac_type == 'dynamic')
+        return table
+
+    def __len__(self):
+        return len(self.vlans)
+
+    @staticmethod
+    def _get_bit(bits, i):
+        return bool(bits[i >> 3] & (1 << (i & 7)))
+
+    def append(self, vlan, mac, interface, static, active):
+        """Append an entry, mac being an integer."""
+        i = len(self.vlans)
+        port = self._interface_index.get(interface)
+        if port is None:
+            port = self._interface_index[interface] = len(self.interfaces)
+            self.interfaces.append(interface)
+        self.vlans.append(vlan)
+        self.macs.append(mac)
+        self.ports.append(port)
+        if i & 7 == 0:
+            self._static.append(0)
+            self._active.append(0)
+        if static:
+            self._static[i >> 3] |= 1 << (i & 7)
+        if active:
+            self._active[i >> 3] |= 1 << (i & 7)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return {
+            'mac': int_to_mac(self.macs[i]),
+            'interface': self.interfaces[self.ports[i]],
+            'vlan': self.vlans[i],
+            'static': self._get_bit(self._static, i),
+            'active': self._get_bit(self._active, i),
+            'moves': -1,
+            'last_move': -1.0
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _select(self, indexes):
+        table = CompactMacTable()
+        for i in indexes:
+            table.append(self.vlans[i], self.macs[i],
+                         self.interfaces[self.ports[i]],
+                         self._get_bit(self._static, i),
+                         self._get_bit(self._active, i))
+        return table
+
+    def filter(self, vlan=None, interface=None):
+        """Return a new table with the entries matching vlan and/or interface."""
+        indexes = range(len(self))
+        if interface is not None:
+            port = self._interface_index.get(interface)
+            if port is None:
+                return CompactMacTable()
+            ports = self.ports
+            indexes = [i for i in indexes if ports[i] == port]
+        if vlan is not None:
+            vlans = self.vlans
+            indexes = [i for i in indexes if vlans[i] == vlan]
+        return self._select(indexes)
+
+    def to_bytes(self):
+        """Serialize the table, see from_bytes."""
+        names = '\n'.join(self.interfaces).encode('utf-8')
+        return b''.join([
+            _HEADER.pack(_MAGIC, _VERSION, len(self), len(self.interfaces),
+                         len(names)),
+            names,
+            _tobytes(self.vlans),
+            _tobytes(self.ports),
+            _tobytes(self.macs),
+            bytes(self._static),
+            bytes(self._active),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a table produced by to_bytes on a machine of the same byte order."""
+        magic, version, entries, interfaces, names_len = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('Not a serialized CompactMacTable')
+        table = cls()
+        pos = _HEADER.size
+        names = data[pos:pos + names_len].decode('utf-8')
+        pos += names_len
+        table.interfaces = names.split('\n') if interfaces else []
+        table._interface_index = dict(
+            (name, i) for i, name in enumerate(table.interfaces))
+        for column in (table.vlans, table.ports, table.macs):
+            size = column.itemsize * entries
+            _frombytes(column, data[pos:pos + size])
+            pos += size
+        flag_bytes = (entries + 7) >> 3
+        table._static = bytearray(data[pos:pos + flag_bytes])
+        pos += flag_bytes
+        table._active = bytearray(data[pos:pos + flag_bytes])
+        return table
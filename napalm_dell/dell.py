@@ -20,18 +20,60 @@ from __future__ import unicode_literals
 
 import re
 import socket
-
-import collections
-from netmiko import ConnectHandler, FileTransfer, InLineTransfer
-# Import NAPALM base
+import threading
+import time
+
+import contextlib
+import difflib
+import io
+import os
+# Import NAPALM base, this loads netmiko, paramiko and pkg_resources too:
+# importing the driver takes about half a second, see
+# 'python -m napalm_dell.benchmark --imports'
 from napalm.base import NetworkDriver
-import napalm.base.utils.string_parsers
-import napalm.base.constants as C
-from napalm.base.utils import py23_compat
-from napalm.base.helpers import ip as cast_ip
-from napalm.base.helpers import mac as cast_mac
-from napalm.base.helpers import canonical_interface_name
+from napalm.base.exceptions import ConnectionClosedException
 from napalm.base.exceptions import ConnectionException
+from napalm.base.exceptions import CommandErrorException
+from napalm.base.exceptions import MergeConfigException
+from napalm.base.exceptions import ReplaceConfigException
+
+from netmiko import ConnectHandler
+
+from napalm_dell import parsers
+from napalm_dell.cache import CommandCache
+from napalm_dell.compact import CompactMacTable
+from napalm_dell.delta import ArpTableTracker, MacTableTracker
+from napalm_dell.pool import SessionPool
+from napalm_dell.replay import ReplayConnection
+from napalm_dell.sampler import EnvironmentSampler
+from napalm_dell.stats import Stats, instrumented
+from napalm_dell.transfer import DNOS6FileTransfer, write_tmp_file
+
+_clock = getattr(time, 'monotonic', time.time)
+
+# Bounds of the channel polling interval of prompt-driven reads, seconds
+MIN_POLL_INTERVAL = 0.002
+MAX_POLL_INTERVAL = 0.1
+# A silent channel is given up after this many round trips (at least
+# MIN_ECHO_TIMEOUT seconds) when not even the command echo arrives
+ECHO_TIMEOUT_RTTS = 20
+MIN_ECHO_TIMEOUT = 2.0
+
+# File system of the candidate files on DNOS6, see _discover_file_system
+DNOS6_FILE_SYSTEM = 'flash:'
+
+# Commands which may change the device configuration, see _send_command
+CONFIG_COMMAND_PREFIXES = ('conf', 'copy', 'write', 'clear', 'delete',
+                           'rename', 'erase', 'reload', 'boot')
+# CLI error messages, e.g. "% Invalid input detected at '^' marker."
+RE_CLI_ERROR = re.compile(r'^\s*% ?(?:Invalid|Incomplete|Ambiguous|Error)',
+                          flags=re.M)
+# Failures of 'copy <file> running-config' besides the CLI errors. Anchored
+# at the start of a line so that echoed configuration text cannot match.
+RE_MERGE_FAILED = re.compile(
+    r'^\s*(?:Error\b|Failed\b|Failure\b|'
+    r'(?:Execution of )?configuration script\b.*\b(?:failed|could not be))',
+    flags=re.M | re.I)
 
 
 class DNOS6Driver(NetworkDriver):
@@ -50,17 +92,19 @@ class DNOS6Driver(NetworkDriver):
         self.merge_cfg = optional_args.get('merge_cfg', 'merge_config.txt')
         self.rollback_cfg = optional_args.get(
             'rollback_cfg', 'rollback_config.txt')
-        self.inline_transfer = optional_args.get('inline_transfer', False)
-        if self.transport == 'telnet':
-            # Telnet only supports inline_transfer
-            self.inline_transfer = True
+        # Candidates are copied by SCP: netmiko's InLineTransfer, the only
+        # way over telnet, drives the IOS tclsh which DNOS6 lacks
+        if optional_args.get('inline_transfer', False):
+            raise ConnectionException(
+                "Inline transfer is not supported on DNOS6, use SSH (SCP)")
 
         # None will cause autodetection of dest_file_system
         self._dest_file_system = optional_args.get('dest_file_system', None)
+        # Restore the configuration saved before a merge that failed
         self.auto_rollback_on_error = optional_args.get(
             'auto_rollback_on_error', True)
 
-        # Control automatic toggling of 'file prompt quiet' for file operations
+        # Answer the (y/n) confirmation of file operations automatically
         self.auto_file_prompt = optional_args.get('auto_file_prompt', True)
 
         # Netmiko possible arguments
@@ -92,95 +136,657 @@ class DNOS6Driver(NetworkDriver):
             'ssh': 22,
             'telnet': 23
         }
-        self.port = optional_args.get('port', default_port[self.transport])
+        self.port = optional_args.get('port', default_port.get(self.transport))
+
+        # Offline replay of captured outputs, see napalm_dell.replay
+        self.replay_dir = optional_args.get('replay_dir', None)
+        self.replay_latency = optional_args.get('replay_latency', 0.0)
+        self.replay_jitter = optional_args.get('replay_jitter', 0.0)
 
         self.device = None
         self.config_replace = False
+        # Local copy of the loaded candidate, used by compare_config
+        self._candidate_file = None
+        self._candidate_tmp = False
 
         self.profile = ["dnos6"]
         self.use_canonical_interface = optional_args.get(
             'canonical_int', False)
+        # interface name translation of all getters, memoized per name
+        self._canonical_int = parsers.InterfaceNames(
+            expand=self.use_canonical_interface).__getitem__
+
+        # Timing statistics, see napalm_dell.stats
+        self._stats = None
+        stats_callback = optional_args.get('stats_callback', None)
+        if optional_args.get('collect_stats', False) or stats_callback:
+            self._stats = Stats(callback=stats_callback)
+
+        # Moves seen by get_mac_address_table; the get_*_delta baselines are
+        # separate so other getters never consume their changes
+        self._mac_tracker = MacTableTracker()
+        self._mac_delta = MacTableTracker()
+        self._arp_delta = ArpTableTracker()
+
+        # Build get_interfaces from 'show interfaces status'
+        self.fast_interfaces = optional_args.get('fast_interfaces', False)
+        self._interface_mac = None
+
+        # Previous (time, counters) sample, see get_interfaces_counters
+        self._counters_sample = None
+
+        # Number of parallel CLI sessions, see napalm_dell.pool
+        self.sessions = optional_args.get('sessions', 1)
+        self._pool = None
+        # Serializes self.device between threads, e.g. the sampler
+        self._device_lock = threading.RLock()
+        self.environment_sampler = None
+
+        # Write independent commands to the channel in one go, opt-in as
+        # it relies on the device echoing the base prompt after each one
+        self.pipeline_commands = optional_args.get('pipeline_commands', False)
+
+        # Read single commands up to the prompt as well, polling the channel
+        # at a rate derived from the measured round trip time
+        self.adaptive_reads = optional_args.get('adaptive_reads', False)
+        # Smoothed round trip time in seconds, None until measured
+        self.rtt = None
+        # command variant list -> index of the variant the device accepted
+        self._command_variants = {}
+
+        # Try to retrieve the LLDP detail of all interfaces at once
+        self._lldp_bulk_detail = optional_args.get('lldp_bulk_detail', True)
+
+        # Command whose output changes whenever the configuration changes,
+        # e.g. a config-change counter or timestamp. Unless it moved, the last
+        # running-config and its parsed form are reused.
+        self.config_change_command = optional_args.get(
+            'config_change_command', None)
+        self._config_state = None
+        # Incremented by clear_cache, see _running_config
+        self._config_generation = 0
+        self._config_lock = threading.Lock()
+
+        # Opt-in cache of command outputs, shared by all getters
+        self._cache = None
+        if optional_args.get('command_cache', False):
+            self._cache = CommandCache(
+                ttl=optional_args.get('command_cache_ttl', 60),
+                size=optional_args.get('command_cache_size', 32))
 
     def open(self):
-        """Open a connection to the device."""
+        """Open a connection to the device.
+
+        With the sessions optional argument greater than one, that many
+        connections are opened in parallel and pooled.
+        """
+        if self.sessions > 1:
+            self._pool = SessionPool.open(self._connect, self.sessions)
+            self.device = self._pool.connections[0]
+        else:
+            self.device = self._connect()
+        self.clear_cache()
+        self._interface_mac = None
+
+    def _connect(self):
+        if self.transport == 'replay':
+            return ReplayConnection(self.replay_dir,
+                                    latency=self.replay_latency,
+                                    jitter=self.replay_jitter)
         device_type = 'dell_dnos6'
         if self.transport == 'telnet':
             device_type = 'dell_dnos6_telnet'
-        self.device = ConnectHandler(device_type=device_type,
-                                     host=self.hostname,
-                                     username=self.username,
-                                     password=self.password,
-                                     **self.netmiko_optional_args)
+        device = ConnectHandler(device_type=device_type,
+                                host=self.hostname,
+                                username=self.username,
+                                password=self.password,
+                                **self.netmiko_optional_args)
         # ensure in enable mode
-        self.device.enable()
+        device.enable()
+        return device
+
+    @contextlib.contextmanager
+    def _session(self):
+        """Borrow a connection of the session pool, or use self.device.
+
+        Not reentrant with a pool: pass the device on rather than nesting.
+        """
+        if self._pool is None:
+            with self._device_lock:
+                yield self.device
+        else:
+            with self._pool.session() as device:
+                yield device
 
     def _discover_file_system(self):
-        try:
-            return self.device._autodetect_fs()
-        except Exception:
-            msg = "Netmiko _autodetect_fs failed (to workaround specify " \
-                  "dest_file_system in optional_args.)"
-            raise CommandErrorException(msg)
+        """Return the file system the candidates are copied to.
+
+        netmiko's _autodetect_fs looks for the IOS 'Directory of' line, which
+        DNOS6 does not print: when it fails and 'dir' lists the flash in the
+        DNOS6 format, DNOS6_FILE_SYSTEM is used.
+        """
+        with self._session() as device:
+            try:
+                return device._autodetect_fs()
+            except Exception:
+                output = device.send_command('dir')
+        files, free = parsers.parse_dir(output)
+        if files or free is not None:
+            return DNOS6_FILE_SYSTEM
+        msg = "Unable to detect the file system (to workaround specify " \
+              "dest_file_system in optional_args.)"
+        raise CommandErrorException(msg)
 
     def close(self):
         """Close the connection to the device."""
-        self.device.disconnect()
+        self.stop_environment_sampler()
+        self.clear_cache()
+        self._discard_candidate_file()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        else:
+            with self._device_lock:
+                self.device.disconnect()
+
+    def clear_cache(self):
+        """Drop all cached command outputs and the last running-config."""
+        # no _config_lock: called with a session borrowed, which a thread
+        # holding _config_lock may be waiting for
+        self._config_generation += 1
+        self._config_state = None
+        if self._cache is not None:
+            self._cache.clear()
+
+    def get_stats(self):
+        """Return a snapshot of the command and getter statistics.
+
+        Empty unless collect_stats or stats_callback is set in optional_args.
+        """
+        if self._stats is None:
+            return {}
+        return self._stats.snapshot()
 
     def _send_command(self, command):
         """Wrapper for self.device.send.command().
 
         If command is a list will iterate through commands until valid command.
+
+        When the command cache is enabled, outputs are served from it until
+        they expire. Commands which may change the configuration are never
+        cached and invalidate the cache.
+        """
+        if self._stats is None:
+            return self._send_command_cached(command)[0]
+        start = _clock()
+        output, cached = self._send_command_cached(command)
+        if isinstance(command, list):
+            command = ' | '.join(command)
+        self._stats.record_command(command, _clock() - start, len(output),
+                                   cached)
+        return output
+
+    def _send_command_cached(self, command):
+        """Return the output of command and whether it came from the cache."""
+        first = command[0] if isinstance(command, list) else command
+        if first.lstrip().startswith(CONFIG_COMMAND_PREFIXES):
+            self.clear_cache()
+            return self._send_command_uncached(command), False
+        if self._cache is None:
+            return self._send_command_uncached(command), False
+
+        key = tuple(command) if isinstance(command, list) else command
+
+        output = self._cache.get(key)
+        if output is not None:
+            return output, True
+        output = self._send_command_uncached(command)
+        # errors may be transient, do not replay them for the whole TTL
+        if not RE_CLI_ERROR.search(output):
+            self._cache.put(key, output)
+        return output, False
+
+    def _send_command_uncached(self, command):
+        with self._session() as device:
+            return self._send_command_on(device, command)
+
+    def _send_command_on(self, device, command):
+        """Send command on device.
+
+        For a list of command variants the one accepted last time is tried
+        first, then the others in order.
         """
         try:
-            if isinstance(command, list):
-                for cmd in command:
-                    output = self.device.send_command(cmd)
-                    if "% Invalid" not in output:
-                        break
-            else:
-                output = self.device.send_command(command)
+            if not isinstance(command, list):
+                return self._read_command(device, command)
+            key = tuple(command)
+            known = self._command_variants.get(key, 0)
+            order = [known] + [i for i in range(len(command)) if i != known]
+            for i in order:
+                output = self._read_command(device, command[i])
+                if "% Invalid" not in output:
+                    self._command_variants[key] = i
+                    break
             # return self._send_command_postprocess(output)
             return output
         except (socket.error, EOFError) as e:
             raise ConnectionClosedException(str(e))
 
+    def _read_command(self, device, command):
+        """Send command on device and read its output.
+
+        With adaptive_reads, a single command goes through the same linear
+        prompt scan as pipelined batches, see _send_commands_pipelined.
+        """
+        if self.adaptive_reads and self.transport != 'replay':
+            return self._send_commands_pipelined(device, [command])[0]
+        return device.send_command(command)
+
+    def _update_rtt(self, sample):
+        if self.rtt is None:
+            self.rtt = sample
+        else:
+            self.rtt = 0.8 * self.rtt + 0.2 * sample
+
+    def _send_commands(self, commands, use_cache=True):
+        """Send independent commands and return the list of their outputs.
+
+        Outputs found in the command cache are not fetched again, unless
+        use_cache is False: then the cache is neither read nor written. The
+        remaining commands run in parallel on the session pool if there is
+        one. With the pipeline_commands option they are pipelined: written to
+        the channel at once and split back per command at the prompts, which
+        costs a single round trip instead of one per command.
+        """
+        cache = self._cache if use_cache else None
+        outputs = [None] * len(commands)
+        if cache is not None:
+            outputs = [cache.get(cmd) for cmd in commands]
+        missing = [cmd for cmd, out in zip(commands, outputs) if out is None]
+        if self._stats is not None:
+            for cmd, out in zip(commands, outputs):
+                if out is not None:
+                    self._stats.record_command(cmd, 0.0, len(out), True)
+        if not missing:
+            return outputs
+
+        start = _clock()
+        if self._pool is not None and len(missing) > 1:
+            fetched = self._pool.map(self._send_command_on, missing)
+        elif (self.pipeline_commands and len(missing) > 1 and
+                self.transport != 'replay'):
+            with self._session() as device:
+                fetched = self._send_commands_pipelined(device, missing)
+        else:
+            fetched = [self._send_command_uncached(cmd) for cmd in missing]
+        if self._stats is not None:
+            # commands of a batch share its time, split evenly between them
+            seconds = (_clock() - start) / len(missing)
+            for cmd, out in zip(missing, fetched):
+                self._stats.record_command(cmd, seconds, len(out))
+
+        fetched = dict(zip(missing, fetched))
+        for i, cmd in enumerate(commands):
+            if outputs[i] is None:
+                outputs[i] = fetched[cmd]
+                if cache is not None and not RE_CLI_ERROR.search(outputs[i]):
+                    cache.put(cmd, outputs[i])
+        return outputs
+
+    def _send_commands_pipelined(self, device, commands):
+        """Write commands to the channel at once, split the output at the prompts.
+
+        Returns as soon as the last prompt is read. The time to the first
+        bytes (the command echo) updates self.rtt, which sets the polling
+        interval and how long to wait for that echo. Once output flows, the
+        driver timeout applies between reads.
+
+        Every read is scanned once: only the new data, preceded by the
+        unfinished last line if that line may still turn into a prompt.
+        """
+        base_prompt = device.base_prompt
+        prompt = re.compile(r'^%s(?:\(.*\))?[>#]' % re.escape(base_prompt),
+                            flags=re.M)
+        poll = 0.01
+        echo_timeout = self.timeout
+        if self.rtt is not None:
+            poll = min(max(self.rtt / 4, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL)
+            echo_timeout = min(max(ECHO_TIMEOUT_RTTS * self.rtt, MIN_ECHO_TIMEOUT),
+                               self.timeout)
+        try:
+            device.clear_buffer()
+            start = _clock()
+            device.write_channel(''.join(cmd + device.RETURN for cmd in commands))
+            chunks = []
+            seen = 0
+            # unfinished last line, kept only while it may become a prompt
+            line = ''
+            line_start = True
+            deadline = start + echo_timeout
+            while seen < len(commands):
+                data = device.read_channel()
+                now = _clock()
+                if not data:
+                    if now > deadline:
+                        raise CommandErrorException(
+                            "Timeout waiting for the output of: %s"
+                            % ', '.join(commands))
+                    time.sleep(poll)
+                    continue
+                if not chunks:
+                    self._update_rtt(now - start)
+                deadline = now + self.timeout
+                data = data.replace('\r', '')
+                chunks.append(data)
+                text = line + data
+                end = 0
+                for m in prompt.finditer(text):
+                    # a match at 0 is only a prompt if text starts a line
+                    if m.start() or line_start:
+                        seen += 1
+                        end = m.end()
+                nl = text.rfind('\n') + 1
+                line = text[nl:]
+                line_start = (nl >= end and (nl or line_start) and
+                              (base_prompt.startswith(line) or
+                               line.startswith(base_prompt)))
+                if not line_start:
+                    line = ''
+        except (socket.error, EOFError) as e:
+            raise ConnectionClosedException(str(e))
+
+        output = ''.join(chunks)
+        if hasattr(device, 'strip_ansi_escape_codes'):
+            output = device.strip_ansi_escape_codes(output)
+        # 'cmd1\n<output1>\nprompt#cmd2\n<output2>\nprompt#'
+        segments = prompt.split(output)[:len(commands)]
+        return [segment.partition('\n')[2].rstrip('\n') for segment in segments]
+
     def is_alive(self):
         """Returns a flag with the state of the connection."""
-        null = chr(0)
         if self.device is None:
             return {'is_alive': False}
+        with self._session() as device:
+            return {'is_alive': self._is_alive(device)}
+
+    def _is_alive(self, device):
+        null = chr(0)
+        if self.transport == 'replay':
+            return device.is_alive()
         if self.transport == 'telnet':
+            # not in the standard library any more as of Python 3.13
+            import telnetlib
             try:
                 # Try sending IAC + NOP (IAC is telnet way of sending command
                 # IAC = Interpret as Command (it comes before the NOP)
-                self.device.write_channel(telnetlib.IAC + telnetlib.NOP)
-                return {'is_alive': True}
+                device.write_channel(telnetlib.IAC + telnetlib.NOP)
+                return True
             except UnicodeDecodeError:
                 # Netmiko logging bug (remove after Netmiko >= 1.4.3)
-                return {'is_alive': True}
+                return True
             except AttributeError:
-                return {'is_alive': False}
+                return False
         else:
             # SSH
             try:
                 # Try sending ASCII null byte to maintain the connection alive
-                self.device.write_channel(null)
-                return {'is_alive': self.device.remote_conn.transport.is_active()}
+                device.write_channel(null)
+                return device.remote_conn.transport.is_active()
             except (socket.error, EOFError):
                 # If unable to send, we can tell for sure that the connection is unusable
-                return {'is_alive': False}
-        return {'is_alive': False}
-
-    @staticmethod
-    def _create_tmp_file(config):
-        """Write temp file and for use with inline config and SCP."""
-        tmp_dir = tempfile.gettempdir()
-        rand_fname = py23_compat.text_type(uuid.uuid4())
-        filename = os.path.join(tmp_dir, rand_fname)
-        with open(filename, 'wt') as fobj:
-            fobj.write(config)
-        return filename
+                return False
+
+    @property
+    def dest_file_system(self):
+        # The self.device check ensures napalm has an open connection
+        if self.device and self._dest_file_system is None:
+            self._dest_file_system = self._discover_file_system()
+        return self._dest_file_system
+
+    def _gen_full_path(self, filename, file_system=None):
+        """Generate full file path on remote device."""
+        if file_system is None:
+            file_system = self.dest_file_system
+        return '{}/{}'.format(file_system, filename)
+
+    def _file_command(self, device, cmd):
+        """Run a file operation on device, answering its (y/n) confirmation.
+
+        Unless auto_file_prompt is set, a confirmation is answered with 'n'
+        and CommandErrorException raised.
+        """
+        # any file operation may touch the configuration
+        self.clear_cache()
+        output = device.send_command(cmd, expect_string=r'\(y/n\)|[>#]\s*$',
+                                     strip_prompt=False,
+                                     strip_command=False)
+        if '(y/n)' in output:
+            if not self.auto_file_prompt:
+                device.send_command_timing('n', strip_prompt=False,
+                                           strip_command=False)
+                msg = "'{}' asks for confirmation, set 'auto_file_prompt' to " \
+                      "answer it".format(cmd)
+                raise CommandErrorException(msg)
+            output += device.send_command('y', expect_string=r'[>#]\s*$',
+                                          strip_prompt=False,
+                                          strip_command=False)
+        return output
+
+    def _xfer_file(self, source_file, dest_file, file_system):
+        """Copy source_file to dest_file on the device.
+
+        The file is always copied by SCP and verified by size afterwards,
+        DNOS6 cannot hash files.
+
+        Returns (status, msg).
+        """
+        with self._session() as device, \
+                DNOS6FileTransfer(device, source_file=source_file,
+                                  dest_file=dest_file, file_system=file_system,
+                                  direction='put') as transfer:
+            if not transfer.verify_space_available():
+                return False, "Insufficient space available on remote device"
+            transfer.transfer_file()
+            if transfer.verify_file():
+                return True, "File successfully transferred to remote device"
+            return False, "File transfer to remote device failed: size mismatch"
+
+    def _load_candidate_wrapper(self, source_file=None, source_config=None,
+                                dest_file=None):
+        """Transfer a file or config to the device for merge or replace operations.
+
+        Returns (status, msg).
+        """
+        if source_file and source_config:
+            raise ValueError("Cannot simultaneously set source_file and source_config")
+        if not source_file and not source_config:
+            raise ValueError("File source not specified for transfer.")
+        if self.transport == 'telnet':
+            raise ConnectionException(
+                "Loading a candidate needs SCP, use the SSH transport")
+
+        self._discard_candidate_file()
+        if source_config:
+            source_file = write_tmp_file(source_config)
+            self._candidate_tmp = True
+        self._candidate_file = source_file
+        try:
+            return self._xfer_file(source_file, dest_file,
+                                   self.dest_file_system)
+        except (socket.error, EOFError) as e:
+            raise ConnectionClosedException(str(e))
+
+    def _discard_candidate_file(self):
+        if self._candidate_tmp and os.path.isfile(self._candidate_file):
+            os.remove(self._candidate_file)
+        self._candidate_file = None
+        self._candidate_tmp = False
+
+    def load_replace_candidate(self, filename=None, config=None):
+        """
+        Copy file to device filesystem, defaults to candidate_config.
+
+        config may be a string or an iterable of lines. Return None or
+        raise exception. The candidate can be compared but not committed,
+        see commit_config.
+        """
+        self.config_replace = True
+        return_status, msg = self._load_candidate_wrapper(
+            source_file=filename, source_config=config,
+            dest_file=self.candidate_cfg)
+        if not return_status:
+            raise ReplaceConfigException(msg)
+
+    def load_merge_candidate(self, filename=None, config=None):
+        """
+        Copy file to device filesystem, defaults to merge_config.
+
+        Merge configuration in: copy <file> running-config
+        """
+        self.config_replace = False
+        return_status, msg = self._load_candidate_wrapper(
+            source_file=filename, source_config=config,
+            dest_file=self.merge_cfg)
+        if not return_status:
+            raise MergeConfigException(msg)
+
+    def compare_config(self):
+        """
+        Diff the running-config against the loaded candidate.
+
+        Replace: unified diff of the whole configuration. Merge: the lines of
+        the merge candidate not yet present in the running-config, prefixed
+        with '+'.
+        """
+        if self._candidate_file is None:
+            return ''
+        running = self._send_command('show running-config').splitlines()
+        with io.open(self._candidate_file, 'rt', encoding='utf-8') as fobj:
+            if self.config_replace:
+                diff = difflib.unified_diff(running, fobj.read().splitlines(),
+                                            'running-config', self.candidate_cfg,
+                                            lineterm='')
+                return '\n'.join(diff)
+            present = set(line.strip() for line in running)
+            return '\n'.join('+' + line.rstrip() for line in fobj
+                             if line.strip() and line.strip() not in present)
+
+    def commit_config(self, message=''):
+        """
+        Merge operation: copy <file> running-config, then save to startup.
+
+        The running-config is saved to rollback_cfg first, see rollback. If
+        the merge fails and auto_rollback_on_error is set, it is merged back.
 
+        DNOS6 has no 'configure replace': committing a replace candidate
+        raises NotImplementedError, it can only be compared.
+        """
+        if message:
+            raise NotImplementedError(
+                "Commit message not implemented for this platform")
+        if self.config_replace:
+            raise NotImplementedError(
+                "Config replace is not supported on DNOS6, use a merge")
+        cfg_file = self._gen_full_path(self.merge_cfg)
+        rollback_file = self._gen_full_path(self.rollback_cfg)
+
+        with self._session() as device:
+            self._gen_rollback_cfg(device, rollback_file)
+            merged, output = self._merge_file(device, cfg_file)
+            if not merged:
+                msg = "Configuration merge failed\n{}".format(output)
+                if self.auto_rollback_on_error:
+                    restored, rollback_output = self._merge_file(
+                        device, rollback_file)
+                    msg += "\nRollback {}\n{}".format(
+                        'done' if restored else 'failed', rollback_output)
+                raise MergeConfigException(msg)
+            device.save_config()
+            # the prompt changes with the hostname
+            device.set_base_prompt()
+        self._discard_candidate_file()
+        self.clear_cache()
+
+    def discard_config(self):
+        """Delete the candidate files from the device."""
+        paths = [self._gen_full_path(filename)
+                 for filename in (self.candidate_cfg, self.merge_cfg)]
+        with self._session() as device:
+            for path in paths:
+                self._file_command(device, 'delete {}'.format(path))
+        self._discard_candidate_file()
+
+    def rollback(self):
+        """Restore the running-config saved by the last commit and save it.
+
+        DNOS6 can only merge the saved configuration: the settings it holds
+        are restored, lines the commit added that it does not set are kept.
+        """
+        rollback_file = self._gen_full_path(self.rollback_cfg)
+        with self._session() as device:
+            restored, output = self._merge_file(device, rollback_file)
+            if not restored:
+                raise CommandErrorException(
+                    "Rollback failed\n{}".format(output))
+            device.save_config()
+            # the prompt changes with the hostname
+            device.set_base_prompt()
+        self.clear_cache()
+
+    def _gen_rollback_cfg(self, device, rollback_file):
+        """Save a configuration that can be used for rollback."""
+        self._file_command(device, 'copy running-config {}'.format(rollback_file))
+
+    def _merge_file(self, device, path):
+        """Merge the file at path into the running-config.
+
+        Returns (success, output).
+        """
+        output = self._file_command(
+            device, 'copy {} running-config'.format(path))
+        failed = RE_CLI_ERROR.search(output) or RE_MERGE_FAILED.search(output)
+        return not failed, output
+
+    def _running_config_probe(self):
+        """Command to send to learn whether the running-config changed."""
+        return self.config_change_command or 'show running-config'
+
+    def _running_config(self, probe_output):
+        """Return the running-config state given the output of _running_config_probe().
+
+        The state is a dictionary with the keys 'config' and 'interfaces',
+        see _interface_config. With config_change_command the running-config
+        is only fetched when the output of that command differs from the
+        previous call. Threads fetch and store the state one at a time.
+        """
+        with self._config_lock:
+            generation = self._config_generation
+            state = self._config_state
+            indicator = None
+            if self.config_change_command:
+                indicator = probe_output
+                if state is not None and state['indicator'] == indicator:
+                    return state
+                config = self._send_command('show running-config')
+            else:
+                config = probe_output
+            if state is None or state['config'] != config:
+                state = {'config': config, 'interfaces': None}
+            state['indicator'] = indicator
+            # not stored if a configuration change cleared it meanwhile
+            if generation == self._config_generation:
+                self._config_state = state
+            return state
+
+    def _interface_config(self, state):
+        """Interface index of the running-config state, parsed once per change."""
+        with self._config_lock:
+            if state['interfaces'] is None:
+                state['interfaces'] = parsers.parse_interface_config(
+                    state['config'])
+            return state['interfaces']
+
+    @instrumented
     def get_config(self, retrieve='all'):
         """Implementation of get_config for DNOS6.
 
@@ -202,12 +808,13 @@ class DNOS6Driver(NetworkDriver):
             configs['startup'] = output
 
         if retrieve in ('running', 'all'):
-            command = 'show running-config'
-            output = self._send_command(command)
-            configs['running'] = output
+            command = self._running_config_probe()
+            configs['running'] = self._running_config(
+                self._send_command(command))['config']
 
         return configs
 
+    @instrumented
     def get_environment(self):
         """
         Get environment facts.
@@ -216,47 +823,34 @@ class DNOS6Driver(NetworkDriver):
         cpu is using 1-minute average
         cpu hard-coded to cpu0 (i.e. only a single CPU)
         """
-        environment = {}
-        cpu_cmd = 'show proc cpu'
-        temp_cmd = 'show system temperature'
+        cpu_output, temp_output = self._send_commands(
+            ['show proc cpu', 'show system temperature'])
+        return parsers.parse_environment(cpu_output, temp_output)
 
-        output = self._send_command(cpu_cmd)
-        environment.setdefault('cpu', {})
-        environment['cpu'][0] = {}
-        environment['cpu'][0]['%usage'] = 0.0
+    def start_environment_sampler(self, interval=5.0, size=720):
+        """Sample CPU, memory and temperature every interval seconds in the background.
 
-        for line in output.splitlines():
-            if 'Total CPU Utilization' in line:
-                # ['Total', 'CPU', 'Utilization', '9.26%', '9.75%', '9.72%']
-                oneminute = float(line.split()[4][:-1])
-                environment['cpu'][0]['%usage'] = float(oneminute)
-                break
-            if 'alloc' in line:
-                used_mem = int(line.split()[1])
-            if 'free' in line:
-                avail_mem = int(line.split()[1])
-
-        environment.setdefault('memory', {})
-        environment['memory']['used_ram'] = used_mem
-        environment['memory']['available_ram'] = used_mem+avail_mem
-
-        environment.setdefault('temperature', {})
-        re_temp_value = re.compile('(.*) Temperature Value')
-        # TODO
-        output = self._send_command(temp_cmd)
-        env_value = {'is_alert': False,
-                     'is_critical': False, 'temperature': -1.0}
-        environment['temperature']['invalid'] = env_value
-
-        # Initialize 'power' and 'fan' to default values (not implemented)
-        environment.setdefault('power', {})
-        environment['power']['invalid'] = {
-            'status': True, 'output': -1.0, 'capacity': -1.0}
-        environment.setdefault('fans', {})
-        environment['fans']['invalid'] = {'status': True}
-
-        return environment
+        Returns the EnvironmentSampler, which keeps the last size samples,
+        see napalm_dell.sampler.
+        """
+        if self.environment_sampler is None:
+            self.environment_sampler = EnvironmentSampler(self, interval, size)
+        return self.environment_sampler.start()
 
+    def stop_environment_sampler(self):
+        if self.environment_sampler is not None:
+            self.environment_sampler.stop()
+
+    def iter_mac_address_table(self):
+        """Yield the entries of the MAC Address Table one at a time.
+
+        See get_mac_address_table for the format of the entries.
+        """
+        output = self._send_command("show mac address-table")
+        return self._mac_tracker.annotate(
+            parsers.iter_mac_address_table(output, self._canonical_int))
+
+    @instrumented
     def get_mac_address_table(self):
         """
         Returns a lists of dictionaries. Each dictionary represents an entry in the MAC Address
@@ -276,39 +870,49 @@ class DNOS6Driver(NetworkDriver):
         -------- --------------------- ----------- ---------------------
         1        0025.90C2.88ED        Dynamic     Gi1/0/48
         1        F48E.3841.9628        Management  Vl1
+
+        moves and last_move are counted from the previous calls of this
+        method, they are 0 and -1.0 until an entry moved to another port.
         """
+        entries = list(self.iter_mac_address_table())
+        self._mac_tracker.update(entries)
+        return entries
 
-        def _process_mac_fields(vlan, mac, mac_type, interface):
-            """Return proper data for mac address fields."""
-            if mac_type.lower() in ['management', 'static']:
-                static = True
-            else:
-                static = False
+    @instrumented
+    def get_mac_address_table_delta(self):
+        """Return the changes of the MAC Address Table since the previous poll.
 
-            if mac_type.lower() in ['dynamic']:
-                active = True
-            else:
-                active = False
-
-            return {
-                'mac': napalm.base.helpers.mac(mac),
-                'interface': self._canonical_int(interface),
-                'vlan': int(vlan),
-                'static': static,
-                'active': active,
-                'moves': -1,
-                'last_move': -1.0
-            }
+        Returns a dictionary with the lists 'added', 'removed' and 'moved',
+        holding entries in the format of get_mac_address_table. Moved
+        entries have the additional key 'previous_interface'. The first
+        call reports every entry as added. The baseline is only advanced by
+        this method, moves and last_move count the moves between its calls.
+        """
+        output = self._send_command("show mac address-table")
+        return self._mac_delta.update(list(
+            parsers.iter_mac_address_table(output, self._canonical_int)))
+
+    @instrumented
+    def get_mac_address_table_compact(self):
+        """Return the MAC Address Table as a CompactMacTable.
 
+        Holds the same data as get_mac_address_table in columnar form,
+        which takes a fraction of the memory on large tables. Iterating it
+        yields the dictionaries of get_mac_address_table, except that moves
+        are not tracked: moves and last_move are always -1 and -1.0.
+        """
         output = self._send_command("show mac address-table")
-        output = re.split(r'^----.*', output, flags=re.M)[1:]
-        output = re.split(r'\n\nTotal.*', output[0], flags=re.M)[0]
-        lines = output.split('\n')
-        entries = []
-        [entries.append(_process_mac_fields(*i.split()))
-         for i in lines if i != '']
-        return entries
+        return CompactMacTable.from_output(output, self._canonical_int)
+
+    def iter_arp_table(self):
+        """Yield the entries of the ARP table one at a time.
 
+        See get_arp_table for the format of the entries.
+        """
+        output = self._send_command("show arp")
+        return parsers.iter_arp_table(output, self._canonical_int)
+
+    @instrumented
     def get_arp_table(self):
         """
         Returns a list of dictionaries having the following set of keys:
@@ -335,145 +939,129 @@ class DNOS6Driver(NetworkDriver):
             ]
 
         """
+        return list(self.iter_arp_table())
 
-        def _process_arp_fields(ip, mac, interface, mac_type, h, m='', s=''):
-            if h == 'n/a':
-                age = -1
-            else:
-                h = int(h[:-1])
-                m = int(m[:-1])
-                s = int(s[:-1])
-                age = h*3600+m*60+s
-            return {
-                'interface': self._canonical_int(interface),
-                'mac': napalm.base.helpers.mac(mac),
-                'ip': ip,
-                'age': float(age)
-            }
+    @instrumented
+    def get_arp_table_delta(self):
+        """Return the changes of the ARP table since the previous poll.
 
-        output = self._send_command("show arp")
-        output = re.split(r'^----.*', output, flags=re.M)[1]
-        lines = output.split('\n')
-        entries = []
-        [entries.append(_process_arp_fields(*i.split()))
-         for i in lines if i != '']
-        return entries
+        Returns a dictionary with the lists 'added', 'removed' and 'moved',
+        holding entries in the format of get_arp_table. Entries whose MAC
+        or interface changed are moved and have the additional keys
+        'previous_mac' and 'previous_interface'. The baseline is only
+        advanced by this method.
+        """
+        return self._arp_delta.update(list(self.iter_arp_table()))
+
+    def _get_interface_mac(self, interface):
+        """Return the L3 MAC address shared by the interfaces, fetched once per session.
+
+        '' if the output has no interface block, which is remembered too.
+        """
+        if self._interface_mac is None:
+            output = self._send_command("show interfaces %s" % interface)
+            self._interface_mac = ''
+            for iface in parsers.iter_show_interfaces(output):
+                self._interface_mac = iface.get('mac', '')
+                break
+        return self._interface_mac
 
+    @instrumented
     def get_interfaces(self):
-        def config_for_iface(iface, configs):
-            for config in configs:
-                if config[0] == iface:
-                    iface_config = config[1]
-                    m = re.search('description: "(.+?)"', iface_config)
-                    descr = ''
-                    if m != None:
-                        descr = m.group(1)
-                    m = re.search('((no )?shutdown)', iface_config)
-                    enabled = not bool(m != None and m.group(1) == 'shutdown')
-                    return (descr, enabled)
-            return ('', True)
-
-        config_raw = self._send_command("show running-config")
-        config_ifaces = re.findall(
-            "!\ninterface (.*)\n((.|\n)*?)\nexit", config_raw)
-        ifaces_raw = self._send_command("show interfaces")
-        ifaces = ifaces_raw.split('\n\n')
-        iface_list = []
-        for iface in ifaces:
-            if iface == '':
-                continue
-            name = re.search('Interface Name : \\.+\s(.*)\n', iface).group(1)
-            speed = re.search('Port Speed : \\.+\s(.*)\n', iface).group(1)
-            mac = re.search('L3 MAC Address\\.+\s(.*)\n', iface).group(1)
-            status = re.search('Link Status : \\.+\s(.*)\n', iface).group(1)
-            description, enabled = config_for_iface(name, config_ifaces)
-            if speed == 'Unknown':
-                speed = 0
-            iface_list.append({self._canonical_int(name): {
-                'is_up': bool(status is 'Up'),
-                'is_enable': enabled,
-                'description': description,
-                'last_flapped': -1,
-                'speed': int(speed),
-                'mac_address': napalm.base.helpers.mac(mac)}
-            })
-        return iface_list
+        """Return the interfaces of the switch.
 
+        With the fast_interfaces optional argument the result is built from
+        the one line per port 'show interfaces status' table instead of the
+        full 'show interfaces' output and the running-config. That table
+        has no link state or speed of port-channels, they are always
+        reported down.
+        """
+        if self.fast_interfaces:
+            output = self._send_command("show interfaces status")
+            first = next(parsers.iter_table_rows(output), None)
+            mac = self._get_interface_mac(first[1][0]) if first else ''
+            return parsers.parse_interfaces_status(output, mac,
+                                                   self._canonical_int)
+        probe, ifaces_raw = self._send_commands(
+            [self._running_config_probe(), "show interfaces"])
+        state = self._running_config(probe)
+        return parsers.build_interfaces(self._interface_config(state),
+                                        ifaces_raw, self._canonical_int)
+
+    @instrumented
+    def get_interfaces_counters(self, rates=False):
+        """Return the counters of all interfaces from a single 'show interfaces'.
+
+        With rates=True every interface also has a 'rates' dictionary with
+        the per second rate of each counter since the previous call on this
+        driver (empty on the first call). Octet counters are not reported by
+        DNOS6 and are -1.
+        """
+        now = _clock()
+        output = self._send_command("show interfaces")
+        counters = parsers.parse_interfaces_counters(output, self._canonical_int)
+        previous = self._counters_sample
+        # keep a copy, the caller owns the returned dictionaries
+        self._counters_sample = (now, dict(
+            (name, dict(iface)) for name, iface in counters.items()))
+        if rates:
+            iface_rates = {}
+            if previous is not None:
+                iface_rates = parsers.counter_rates(previous[1], counters,
+                                                    now - previous[0])
+            for name, iface in counters.items():
+                iface['rates'] = iface_rates.get(name, {})
+        return counters
+
+    @instrumented
     def get_lldp_neighbors(self):
-        result = collections.defaultdict(list)
         output = self._send_command("show lldp remote-device all")
-        output = re.split(r'^----.*', output, flags=re.M)[1]
-        lines = output.split('\n')
-        for line in lines:
-            if line == '':
-                continue
-            iface = line[0:10].strip()
-            portid = line[38:55]
-            systemname = line[57:].strip()
-            if systemname == '':
-                systemname = None
-            result[iface].append({'hostname': systemname,
-                                  'port': portid
-                                  })
-        return dict(result)
+        return parsers.parse_lldp_neighbors(output, self._canonical_int)
 
     def _get_lldp_neighbor_detail_iface(self, interface):
-        caps_map = {
-            'bridge': 'B',
-            'router': 'R',
-            'WLAN access point': 'W',
-            'station only': 'S',
-        }
-        # support empty interface
         output = self._send_command(
             "show lldp remote-device detail %s" % interface)
-        chassis_id = re.search(r'Chassis ID: (.+)', output).group(1)
-        try:
-            system_name = re.search(r'System Name: (.+)', output).group(1)
-        except:
-            system_name = ''
-        try:
-            port_description = re.search(
-                r'Port Description: (.+)', output).group(1)
-        except:
-            port_description = ''
-        try:
-            caps_supported_output = re.search(
-                r'System Capabilities Supported: (.+)', output).group(1)
-        except:
-            caps_supported_output = ''
-        try:
-            caps_enabled_output = re.search(
-                r'System Capabilities Enabled: (.+)', output).group(1)
-        except:
-            caps_enabled_output = ''
-
-        caps_supported = caps_supported_output.split(', ')
-        caps_supported = [[caps_maps[cap] for cap in caps_supported]]
-        caps_enabled = caps_enabled_output.split(', ')
-        caps_enabled = [[caps_enabled[cap] for cap in caps_enabled]]
-
-        return {
-            #                'parent_interface': u''
-            'remote_chassis_id': chassis_id,
-            'remote_system_name': system_name,
-            'remote_port': port_description,
-            'remote_port_description': port_description,
-            'remote_system_description': system_decription,
-            'remote_system_capab': caps_supported.join(', '),
-            'remote_system_enable_capab': caps_enabled.join(', ')
-        }
+        return [detail for _, detail in
+                parsers.iter_lldp_neighbor_detail(output, interface)]
+
+    def _get_lldp_neighbor_detail_bulk(self):
+        """Fetch the LLDP detail of all interfaces with a single command.
 
+        Returns None if the switch does not support the bulk command, which
+        is remembered for the rest of the session.
+        """
+        if not self._lldp_bulk_detail:
+            return None
+        output = self._send_command("show lldp remote-device detail all")
+        if "% Invalid" in output:
+            self._lldp_bulk_detail = False
+            return None
+        return parsers.parse_lldp_neighbor_detail(
+            output, canonical_int=self._canonical_int)
+
+    @instrumented
     def get_lldp_neighbor_detail(self, interface=''):
-        if interface == '':
-            ifaces = []
-            neighs = self.get_lldp_neighbors()
-            for iface in neighs:
-                ifaces.append(self._get_lldp_neighbor_detail_iface(iface))
-            return ifaces
-        else:
-            return _get_lldp_neighbor_detail_iface(iface)
+        """Return the detailed LLDP neighbors, keyed by local interface.
+
+        Without an interface all neighbors are fetched in one round trip,
+        falling back to one command per neighbor interface when the switch
+        does not accept 'show lldp remote-device detail all'.
+        """
+        if interface:
+            return {self._canonical_int(interface):
+                    self._get_lldp_neighbor_detail_iface(interface)}
+        result = self._get_lldp_neighbor_detail_bulk()
+        if result is not None:
+            return result
+        result = {}
+        # the commands take the interface names as the switch prints them
+        output = self._send_command("show lldp remote-device all")
+        for iface in parsers.parse_lldp_neighbors(output):
+            result[self._canonical_int(iface)] = \
+                self._get_lldp_neighbor_detail_iface(iface)
+        return result
 
+    @instrumented
     def get_ntp_peers(self):
         """
         Returns the NTP peers configuration as dictionary.
@@ -491,13 +1079,10 @@ class DNOS6Driver(NetworkDriver):
 
         """
         output = self._send_command("show sntp server")
-        output = re.findall('Host Address:\s(\S+)', output)
-        entries = dict()
-        for i in output:
-            entries[i] = {}
-        return entries
+        return parsers.parse_ntp_peers(output)
 
-    def getnfacts(self):
+    @instrumented
+    def get_facts(self):
         """
         Returns a dictionary containing the following information:
          * uptime - Uptime of the device in seconds.
@@ -509,29 +1094,24 @@ class DNOS6Driver(NetworkDriver):
          * serial_number - Serial number of the device
          * interface_list - List of the interfaces of the device
 
+        The four commands needed are sent with _send_commands.
+
         Example::
 
             {
-            'uptime': 151005.57332897186,
-            'vendor': u'Arista',
-            'os_version': u'4.14.3-2329074.gaatlantarel',
-            'serial_number': u'SN0123A34AS',
-            'model': u'vEOS',
-            'hostname': u'eos-router',
-            'fqdn': u'eos-router',
-            'interface_list': [u'Ethernet2', u'Management1', u'Ethernet1', u'Ethernet3']
+            'uptime': 151005.0,
+            'vendor': u'Dell',
+            'os_version': u'6.2.7.2',
+            'serial_number': u'CN0123456789',
+            'model': u'N2048P',
+            'hostname': u'sw1',
+            'fqdn': u'sw1.example.com',
+            'interface_list': [u'Gi1/0/1', u'Gi1/0/2', u'Te1/0/1', u'Po1']
             }
 
         """
-
-        return {
-            'uptime': 151005.57332897186,
-            'vendor': u'Dell',
-            'os_version': u'4.14.3-2329074.gaatlantarel',
-            'serial_number': u'SN0123A34AS',
-            'model': u'vEOS',
-            'hostname': u'eos-router',
-            'fqdn': u'eos-router',
-            'interface_list': [u'Ethernet2', u'Management1', u'Ethernet1', u'Ethernet3']
-
-        }
+        version, system, hosts, status = self._send_commands([
+            'show version', 'show system', 'show hosts',
+            'show interfaces status'])
+        return parsers.parse_facts(version, system, hosts, status,
+                                   self._canonical_int)
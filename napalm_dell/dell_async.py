@@ -0,0 +1,262 @@
+"""Asyncio variant of the DellEMC PowerConnect (DNOS6) driver.
+
+AsyncDNOS6Driver offers the getters of DNOS6Driver as coroutines on top of a
+non-blocking asyncssh session, so a single event loop can keep many devices
+in flight. Output is parsed with the same functions from napalm_dell.parsers.
+
+asyncssh is an optional dependency (``pip install napalm-dell[async]``).
+
+Example::
+
+    async def poll(host):
+        async with AsyncDNOS6Driver(host, 'admin', 'secret') as device:
+            return await device.get_interfaces()
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import asyncio
+import re
+
+from napalm.base.exceptions import ConnectionException
+from napalm.base.exceptions import ConnectionClosedException
+from napalm.base.exceptions import CommandErrorException
+
+from napalm_dell import parsers
+from napalm_dell.cache import CommandCache
+from napalm_dell.dell import CONFIG_COMMAND_PREFIXES, RE_CLI_ERROR
+
+# 'switch>', 'switch#', 'switch(config-if-Gi1/0/1)#'
+RE_PROMPT = re.compile(r'(?:^|\n)[\w.\-]+(?:\([\w.\-/]+\))?[#>] ?$')
+RE_PASSWORD = re.compile(r'[Pp]assword: ?$')
+
+READ_SIZE = 65536
+
+
+class AsyncDNOS6Driver(object):
+    def __init__(self, hostname, username, password, timeout=60, optional_args=None):
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        optional_args = optional_args or dict()
+
+        self.port = optional_args.get('port', 22)
+        self.secret = optional_args.get('secret', '')
+        # Host keys are only verified with ssh_strict, like netmiko does
+        self.ssh_options = {}
+        if not optional_args.get('ssh_strict', False):
+            self.ssh_options['known_hosts'] = None
+        if optional_args.get('key_file'):
+            self.ssh_options['client_keys'] = [optional_args['key_file']]
+
+        self.use_canonical_interface = optional_args.get(
+            'canonical_int', False)
+        # interface name translation of all getters, memoized per name
+        self._canonical_int = parsers.InterfaceNames(
+            expand=self.use_canonical_interface).__getitem__
+        self._lldp_bulk_detail = optional_args.get('lldp_bulk_detail', True)
+
+        self._cache = None
+        if optional_args.get('command_cache', False):
+            self._cache = CommandCache(
+                ttl=optional_args.get('command_cache_ttl', 60),
+                size=optional_args.get('command_cache_size', 32))
+
+        self._conn = None
+        self._stdin = None
+        self._stdout = None
+        # One command at a time per channel, created in open() as before
+        # Python 3.10 a lock binds to the event loop current at creation
+        self._lock = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open(self):
+        """Open a connection to the device."""
+        try:
+            import asyncssh
+        except ImportError:
+            raise ConnectionException(
+                "AsyncDNOS6Driver requires asyncssh (pip install asyncssh)")
+        self._lock = asyncio.Lock()
+        try:
+            self._conn = await asyncio.wait_for(
+                asyncssh.connect(self.hostname, port=self.port,
+                                 username=self.username,
+                                 password=self.password,
+                                 **self.ssh_options),
+                self.timeout)
+            self._stdin, self._stdout, _ = await self._conn.open_session(
+                term_type='vt100', term_size=(511, 24))
+            prompt = await self._read_until(RE_PROMPT)
+            # ensure in enable mode
+            if prompt.rstrip().endswith('>'):
+                self._stdin.write('enable\n')
+                output = await self._read_until(RE_PROMPT, RE_PASSWORD)
+                if RE_PASSWORD.search(output):
+                    self._stdin.write(self.secret + '\n')
+                    await self._read_until(RE_PROMPT)
+            self._stdin.write('terminal length 0\n')
+            await self._read_until(RE_PROMPT)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ConnectionException(
+                "Cannot connect to %s: %s" % (self.hostname, e))
+        self.clear_cache()
+
+    async def close(self):
+        """Close the connection to the device."""
+        self.clear_cache()
+        if self._conn is not None:
+            self._conn.close()
+            await self._conn.wait_closed()
+            self._conn = None
+
+    def is_alive(self):
+        """Returns a flag with the state of the connection."""
+        return {'is_alive': self._conn is not None and
+                not self._stdout.at_eof()}
+
+    def clear_cache(self):
+        """Drop all cached command outputs."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    async def _read_until(self, *patterns):
+        """Read from the channel until the tail of the output matches a pattern."""
+        chunks = []
+        tail = ''
+        while True:
+            chunk = await asyncio.wait_for(
+                self._stdout.read(READ_SIZE), self.timeout)
+            if not chunk:
+                raise ConnectionClosedException(
+                    "Connection to %s closed" % self.hostname)
+            chunk = chunk.replace('\r', '')
+            chunks.append(chunk)
+            tail = (tail + chunk)[-256:]
+            for pattern in patterns:
+                if pattern.search(tail):
+                    return ''.join(chunks)
+
+    async def _send_command_uncached(self, command):
+        commands = command if isinstance(command, list) else [command]
+        async with self._lock:
+            for cmd in commands:
+                self._stdin.write(cmd + '\n')
+                try:
+                    output = await self._read_until(RE_PROMPT)
+                except asyncio.TimeoutError:
+                    raise CommandErrorException(
+                        "Timeout waiting for the output of: %s" % cmd)
+                except OSError as e:
+                    raise ConnectionClosedException(str(e))
+                # strip the command echo and the trailing prompt
+                output = output.split('\n', 1)[-1]
+                output = output.rsplit('\n', 1)[0] if '\n' in output else ''
+                if "% Invalid" not in output:
+                    break
+        return output
+
+    async def _send_command(self, command):
+        """Send a command and return its output, see DNOS6Driver._send_command."""
+        if self._cache is None:
+            return await self._send_command_uncached(command)
+
+        key = tuple(command) if isinstance(command, list) else command
+        first = command[0] if isinstance(command, list) else command
+        if first.lstrip().startswith(CONFIG_COMMAND_PREFIXES):
+            self._cache.clear()
+            return await self._send_command_uncached(command)
+
+        output = self._cache.get(key)
+        if output is None:
+            output = await self._send_command_uncached(command)
+            if not RE_CLI_ERROR.search(output):
+                self._cache.put(key, output)
+        return output
+
+    async def get_config(self, retrieve='all'):
+        configs = {
+            'startup': '',
+            'running': '',
+            'candidate': '',
+        }
+        if retrieve in ('startup', 'all'):
+            configs['startup'] = await self._send_command('show startup-config')
+        if retrieve in ('running', 'all'):
+            configs['running'] = await self._send_command('show running-config')
+        return configs
+
+    async def get_facts(self):
+        version = await self._send_command('show version')
+        system = await self._send_command('show system')
+        hosts = await self._send_command('show hosts')
+        status = await self._send_command('show interfaces status')
+        return parsers.parse_facts(version, system, hosts, status,
+                                   self._canonical_int)
+
+    async def get_environment(self):
+        cpu_output = await self._send_command('show proc cpu')
+        temp_output = await self._send_command('show system temperature')
+        return parsers.parse_environment(cpu_output, temp_output)
+
+    async def get_mac_address_table(self):
+        """Moves are not tracked here, moves and last_move are -1 and -1.0."""
+        output = await self._send_command("show mac address-table")
+        return list(parsers.iter_mac_address_table(output, self._canonical_int))
+
+    async def get_arp_table(self):
+        output = await self._send_command("show arp")
+        return list(parsers.iter_arp_table(output, self._canonical_int))
+
+    async def get_interfaces(self):
+        config_raw = await self._send_command("show running-config")
+        ifaces_raw = await self._send_command("show interfaces")
+        return parsers.parse_interfaces(config_raw, ifaces_raw,
+                                        self._canonical_int)
+
+    async def get_lldp_neighbors(self):
+        output = await self._send_command("show lldp remote-device all")
+        return parsers.parse_lldp_neighbors(output, self._canonical_int)
+
+    async def get_lldp_neighbor_detail(self, interface=''):
+        if interface:
+            output = await self._send_command(
+                "show lldp remote-device detail %s" % interface)
+            return {self._canonical_int(interface): [
+                detail for _, detail in
+                parsers.iter_lldp_neighbor_detail(output, interface)]}
+        if self._lldp_bulk_detail:
+            output = await self._send_command(
+                "show lldp remote-device detail all")
+            if "% Invalid" not in output:
+                return parsers.parse_lldp_neighbor_detail(
+                    output, canonical_int=self._canonical_int)
+            self._lldp_bulk_detail = False
+        result = {}
+        # the commands take the interface names as the switch prints them
+        output = await self._send_command("show lldp remote-device all")
+        for iface in parsers.parse_lldp_neighbors(output):
+            result.update(await self.get_lldp_neighbor_detail(iface))
+        return result
+
+    async def get_ntp_peers(self):
+        output = await self._send_command("show sntp server")
+        return parsers.parse_ntp_peers(output)
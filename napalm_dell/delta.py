@@ -0,0 +1,174 @@
+"""Differences between successive MAC and ARP table polls.
+
+The trackers keep the previous table of a driver as a dict keyed by
+(vlan, mac) respectively ip, so a new poll is compared in linear time. The
+MAC tracker also counts how often an entry moved to another interface,
+which fills the 'moves' and 'last_move' fields of get_mac_address_table.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import time
+
+
+class _TableTracker(object):
+    """Keeps the last snapshot of a table, subclasses define its key and value."""
+
+    def __init__(self):
+        self._snapshot = None
+
+    @staticmethod
+    def _key(entry):
+        raise NotImplementedError
+
+    @staticmethod
+    def _value(entry):
+        raise NotImplementedError
+
+    @staticmethod
+    def _entry(key, value):
+        raise NotImplementedError
+
+    def _moved(self, key, entry, previous, now):
+        """Called for an entry whose value differs from the previous poll."""
+        pass
+
+    def _forget(self, key):
+        pass
+
+    def reset(self):
+        self._snapshot = None
+
+    def update(self, entries, now=None):
+        """Store the list entries as the new snapshot and return the difference to the previous one.
+
+        Returns a dictionary with the lists 'added', 'removed' and 'moved'.
+        Moved entries carry the previous value under 'previous_interface'
+        (and 'previous_mac' for ARP entries). On the first call all entries
+        are reported as added.
+        """
+        if now is None:
+            now = time.time()
+        old = self._snapshot or {}
+        new = {}
+        added = []
+        moved = []
+        for entry in entries:
+            key = self._key(entry)
+            value = self._value(entry)
+            new[key] = value
+            previous = old.get(key)
+            if previous is None:
+                added.append(entry)
+            elif previous != value:
+                self._moved(key, entry, previous, now)
+                moved.append(entry)
+        removed = []
+        for key, value in old.items():
+            if key not in new:
+                removed.append(self._entry(key, value))
+                self._forget(key)
+        self._snapshot = new
+        return {'added': added, 'removed': removed, 'moved': moved}
+
+
+class MacTableTracker(_TableTracker):
+    """Tracks get_mac_address_table entries keyed by (vlan, mac)."""
+
+    def __init__(self):
+        super(MacTableTracker, self).__init__()
+        # (vlan, mac) -> (moves, last_move) of entries seen moving
+        self._moves = {}
+
+    @staticmethod
+    def _key(entry):
+        return entry['vlan'], entry['mac']
+
+    @staticmethod
+    def _value(entry):
+        return entry['interface'], entry['static'], entry['active']
+
+    @staticmethod
+    def _entry(key, value):
+        return {
+            'mac': key[1],
+            'interface': value[0],
+            'vlan': key[0],
+            'static': value[1],
+            'active': value[2],
+            'moves': -1,
+            'last_move': -1.0
+        }
+
+    def _moved(self, key, entry, previous, now):
+        if previous[0] == entry['interface']:
+            return
+        moves = self._moves.get(key, (0, -1.0))[0] + 1
+        self._moves[key] = (moves, now)
+        entry['previous_interface'] = previous[0]
+
+    def _forget(self, key):
+        self._moves.pop(key, None)
+
+    def reset(self):
+        super(MacTableTracker, self).reset()
+        self._moves.clear()
+
+    def annotate(self, entries):
+        """Fill 'moves' and 'last_move' of entries already seen by update."""
+        snapshot = self._snapshot
+        for entry in entries:
+            if snapshot is not None:
+                key = (entry['vlan'], entry['mac'])
+                if key in snapshot:
+                    entry['moves'], entry['last_move'] = self._moves.get(
+                        key, (0, -1.0))
+            yield entry
+
+    def update(self, entries, now=None):
+        delta = super(MacTableTracker, self).update(entries, now)
+        # only the interface matters for a move, flag changes are not reported
+        delta['moved'] = [e for e in delta['moved'] if 'previous_interface' in e]
+        moves = self._moves
+        for entry in entries:
+            entry['moves'], entry['last_move'] = moves.get(
+                (entry['vlan'], entry['mac']), (0, -1.0))
+        return delta
+
+
+class ArpTableTracker(_TableTracker):
+    """Tracks get_arp_table entries keyed by ip."""
+
+    @staticmethod
+    def _key(entry):
+        return entry['ip']
+
+    @staticmethod
+    def _value(entry):
+        return entry['mac'], entry['interface']
+
+    @staticmethod
+    def _entry(key, value):
+        return {
+            'interface': value[1],
+            'mac': value[0],
+            'ip': key,
+            'age': -1.0
+        }
+
+    def _moved(self, key, entry, previous, now):
+        entry['previous_mac'] = previous[0]
+        entry['previous_interface'] = previous[1]
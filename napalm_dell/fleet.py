@@ -0,0 +1,200 @@
+"""Run DNOS6Driver getters across many switches in parallel.
+
+Example::
+
+    inventory = [
+        {'hostname': 'sw1', 'username': 'admin', 'password': 'secret'},
+        {'hostname': 'sw2', 'username': 'admin', 'password': 'secret',
+         'optional_args': {'port': 2222}},
+    ]
+    with FleetRunner(inventory, max_workers=64) as fleet:
+        for device in fleet.run(['get_interfaces', 'get_lldp_neighbors']):
+            print(device.hostname, device.results, device.errors)
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import collections
+import socket
+import threading
+import time
+from concurrent import futures
+
+from napalm.base.exceptions import ConnectionException
+from napalm.base.exceptions import ConnectionClosedException
+
+from napalm_dell.dell import DNOS6Driver
+
+_clock = getattr(time, 'monotonic', time.time)
+
+# Errors after which a session is not reused
+SESSION_ERRORS = (ConnectionException, ConnectionClosedException,
+                  socket.error, EOFError)
+
+
+class DeviceResult(collections.namedtuple(
+        'DeviceResult', ['hostname', 'results', 'errors', 'elapsed'])):
+    """Outcome of one device in a FleetRunner run.
+
+    results maps getter name -> return value, errors maps getter name (or
+    'open' / 'timeout') -> exception.
+    """
+
+    __slots__ = ()
+
+
+class FleetRunner(object):
+    """Run getters across an inventory of switches with a bounded worker pool.
+
+    inventory is an iterable of dicts with the DNOS6Driver arguments
+    (hostname, username, password and optionally timeout, optional_args).
+    Sessions are kept open between runs and reused while they are alive.
+    A device taking longer than device_timeout seconds is reported with a
+    'timeout' error and its session is discarded.
+    """
+
+    def __init__(self, inventory, max_workers=16, device_timeout=300,
+                 driver=DNOS6Driver):
+        self.inventory = collections.OrderedDict(
+            (device['hostname'], device) for device in inventory)
+        self.device_timeout = device_timeout
+        self.driver = driver
+        self._pool = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._sessions = {}
+        # hostname -> start time of the worker currently handling it
+        self._running = {}
+        self._abandoned = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close all sessions and stop the worker pool."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for device in sessions.values():
+            self._close_session(device)
+        self._pool.shutdown(wait=False)
+
+    @staticmethod
+    def _close_session(device):
+        try:
+            device.close()
+        except Exception:
+            pass
+
+    def _session(self, hostname):
+        """Return an open session to hostname, reusing a live one."""
+        with self._lock:
+            device = self._sessions.pop(hostname, None)
+        if device is not None:
+            try:
+                if device.is_alive()['is_alive']:
+                    return device
+            except Exception:
+                pass
+            self._close_session(device)
+        params = self.inventory[hostname]
+        device = self.driver(params['hostname'], params['username'],
+                             params['password'],
+                             timeout=params.get('timeout', 60),
+                             optional_args=params.get('optional_args'))
+        device.open()
+        return device
+
+    def _work(self, hostname, getters):
+        start = _clock()
+        with self._lock:
+            self._running[hostname] = start
+        results = {}
+        errors = {}
+        device = None
+        try:
+            device = self._session(hostname)
+        except Exception as e:
+            errors['open'] = e
+        if device is not None:
+            for name, kwargs in getters:
+                try:
+                    results[name] = getattr(device, name)(**kwargs)
+                except SESSION_ERRORS as e:
+                    errors[name] = e
+                    self._close_session(device)
+                    device = None
+                    break
+                except Exception as e:
+                    errors[name] = e
+        with self._lock:
+            del self._running[hostname]
+            if hostname in self._abandoned:
+                self._abandoned.discard(hostname)
+            elif device is not None:
+                self._sessions[hostname] = device
+                device = None
+        if device is not None:
+            self._close_session(device)
+        return DeviceResult(hostname, results, errors, _clock() - start)
+
+    def run(self, getters, hostnames=None):
+        """Run getters on the inventory and yield a DeviceResult per device as it finishes.
+
+        getters is a list of getter names or (name, kwargs) tuples. hostnames
+        restricts the run to part of the inventory.
+        """
+        getters = [(g, {}) if not isinstance(g, tuple) else g for g in getters]
+        pending = {}
+        for hostname in hostnames or self.inventory:
+            with self._lock:
+                busy = hostname in self._running
+            if busy:
+                yield DeviceResult(hostname, {}, {'open': ConnectionException(
+                    "%s is still busy with a previous run" % hostname)}, 0.0)
+                continue
+            pending[self._pool.submit(self._work, hostname, getters)] = hostname
+
+        while pending:
+            timeout = self._next_deadline(pending.values())
+            done, _ = futures.wait(pending, timeout=timeout,
+                                   return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                yield future.result()
+            now = _clock()
+            for future, hostname in list(pending.items()):
+                with self._lock:
+                    start = self._running.get(hostname)
+                    expired = (start is not None and not future.done() and
+                               now - start > self.device_timeout)
+                    if expired:
+                        self._abandoned.add(hostname)
+                if expired:
+                    del pending[future]
+                    error = futures.TimeoutError("%s did not finish within %ss"
+                                                 % (hostname, self.device_timeout))
+                    yield DeviceResult(hostname, {}, {'timeout': error},
+                                       now - start)
+
+    def _next_deadline(self, hostnames):
+        """Seconds until the earliest of the running hostnames times out."""
+        with self._lock:
+            starts = [self._running[h] for h in hostnames if h in self._running]
+        if not starts:
+            return 1.0
+        return max(0.0, min(starts) + self.device_timeout - _clock()) + 0.01
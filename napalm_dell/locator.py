@@ -0,0 +1,207 @@
+"""Find the switch port of an IP or MAC address across a fleet.
+
+The Locator indexes the ARP, MAC address and LLDP neighbor tables of many
+switches in dictionaries, so lookups do not touch the devices::
+
+    locator = Locator()
+    with FleetRunner(inventory) as fleet:
+        locator.refresh(fleet)
+    locator.locate('10.0.3.17')
+    # Location(mac='00:25:90:C2:88:ED', hostname='sw2', interface='Gi1/0/12',
+    #          vlan=3, edge=True)
+
+A MAC address is seen on every switch between its port and the querying
+switches; interfaces with LLDP neighbors are uplinks, so a location on an
+edge port is preferred. Interface names are compared expanded, so tables
+with short and canonical names can be mixed.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import collections
+import re
+import threading
+
+from napalm_dell.compact import int_to_mac, mac_to_int
+from napalm_dell.parsers import InterfaceNames
+
+REFRESH_GETTERS = ['get_lldp_neighbors', 'get_arp_table', 'get_mac_address_table']
+
+
+# 'F48E.3841.9628', 'F4:8E:38:41:96:28', 'f4-8e-38-41-96-28', 'f48e38419628'
+RE_MAC = re.compile(r'^[0-9a-fA-F]{2}(?:[.:-]?[0-9a-fA-F]{2}){5}$')
+
+
+class Location(collections.namedtuple(
+        'Location', ['mac', 'hostname', 'interface', 'vlan', 'edge'])):
+    """Where a MAC address was learned, edge is False on uplinks."""
+
+    __slots__ = ()
+
+
+class Locator(object):
+    """Indexes IP -> MAC and MAC -> locations of many switches.
+
+    MAC addresses are stored as integers, lookups accept any notation.
+    Updating a switch only touches the entries that changed since its
+    previous update.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # ip -> {hostname: mac}
+        self._arp = {}
+        # mac -> {(hostname, vlan): interface}
+        self._macs = {}
+        # mac -> best Location, the answer of locate_mac
+        self._best = {}
+        # hostname -> its last tables, to compute the changes of an update
+        self._device_arp = {}
+        self._device_macs = {}
+        # hostname -> expanded names of the interfaces with LLDP neighbors
+        self._uplinks = {}
+        self._names = InterfaceNames()
+
+    def __len__(self):
+        return len(self._macs)
+
+    def update_device(self, hostname, mac_table=None, arp_table=None,
+                      lldp_neighbors=None):
+        """Replace the tables of one switch with the getter results given.
+
+        Tables passed as None are kept from the previous update.
+        """
+        with self._lock:
+            touched = set()
+            if lldp_neighbors is not None:
+                uplinks = frozenset(self._names[name] for name in lldp_neighbors)
+                if uplinks != self._uplinks.get(hostname):
+                    self._uplinks[hostname] = uplinks
+                    touched.update(mac for mac, _ in
+                                   self._device_macs.get(hostname, ()))
+            if mac_table is not None:
+                self._update_macs(hostname, mac_table, touched)
+            if arp_table is not None:
+                self._update_arp(hostname, arp_table)
+            for mac in touched:
+                self._rank(mac)
+
+    def remove_device(self, hostname):
+        """Forget everything learned from hostname."""
+        self.update_device(hostname, mac_table=[], arp_table=[],
+                           lldp_neighbors={})
+        with self._lock:
+            self._device_macs.pop(hostname, None)
+            self._device_arp.pop(hostname, None)
+            self._uplinks.pop(hostname, None)
+
+    def _update_macs(self, hostname, mac_table, touched):
+        # a MAC address may be learned in several VLANs of a switch
+        old = self._device_macs.get(hostname, {})
+        new = {}
+        for entry in mac_table:
+            new[(mac_to_int(entry['mac']), entry['vlan'])] = entry['interface']
+        macs = self._macs
+        for (mac, vlan), interface in new.items():
+            if old.get((mac, vlan)) != interface:
+                macs.setdefault(mac, {})[(hostname, vlan)] = interface
+                touched.add(mac)
+        for mac, vlan in old:
+            if (mac, vlan) not in new:
+                seen = macs[mac]
+                del seen[(hostname, vlan)]
+                if not seen:
+                    del macs[mac]
+                touched.add(mac)
+        self._device_macs[hostname] = new
+
+    def _update_arp(self, hostname, arp_table):
+        old = self._device_arp.get(hostname, {})
+        new = {}
+        for entry in arp_table:
+            new[entry['ip']] = mac_to_int(entry['mac'])
+        arp = self._arp
+        for ip, mac in new.items():
+            if old.get(ip) != mac:
+                arp.setdefault(ip, {})[hostname] = mac
+        for ip in old:
+            if ip not in new:
+                seen = arp[ip]
+                del seen[hostname]
+                if not seen:
+                    del arp[ip]
+        self._device_arp[hostname] = new
+
+    def _locations(self, mac):
+        uplinks = self._uplinks
+        names = self._names
+        return [Location(int_to_mac(mac), hostname, interface, vlan,
+                         names[interface] not in uplinks.get(hostname, ()))
+                for (hostname, vlan), interface in self._macs.get(mac, {}).items()]
+
+    def _rank(self, mac):
+        locations = self._locations(mac)
+        if not locations:
+            self._best.pop(mac, None)
+            return
+        self._best[mac] = min(locations,
+                              key=lambda l: (not l.edge, l.hostname, l.interface,
+                                             l.vlan))
+
+    def locate_mac(self, mac):
+        """Return the best Location of mac, preferring edge ports, or None."""
+        return self._best.get(mac_to_int(mac))
+
+    def locate_ip(self, ip):
+        """Return the best Location of the MAC address ip resolves to, or None."""
+        macs = self._arp.get(ip)
+        if not macs:
+            return None
+        for mac in macs.values():
+            location = self._best.get(mac)
+            if location is not None:
+                return location
+        return None
+
+    def locate(self, address):
+        """Locate an IP or MAC address."""
+        if RE_MAC.match(address):
+            return self.locate_mac(address)
+        return self.locate_ip(address)
+
+    def locations(self, mac):
+        """Return all Locations of mac, edge ports first."""
+        with self._lock:
+            return sorted(self._locations(mac_to_int(mac)),
+                          key=lambda l: (not l.edge, l.hostname, l.interface,
+                                         l.vlan))
+
+    def refresh(self, fleet, hostnames=None):
+        """Update the indexes from a FleetRunner run.
+
+        Switches whose tables could not be retrieved keep their previous
+        entries. Returns {hostname: errors} of the switches with errors.
+        """
+        failed = {}
+        for device in fleet.run(REFRESH_GETTERS, hostnames):
+            results = device.results
+            self.update_device(device.hostname,
+                               mac_table=results.get('get_mac_address_table'),
+                               arp_table=results.get('get_arp_table'),
+                               lldp_neighbors=results.get('get_lldp_neighbors'))
+            if device.errors:
+                failed[device.hostname] = device.errors
+        return failed
@@ -0,0 +1,772 @@
+"""Output parsers for DellEMC PowerConnect (DNOS6) CLI commands.
+
+The functions in this module operate on plain command output and do not
+touch the device, so they can be shared between driver implementations and
+used on saved captures.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import bisect
+import collections
+import re
+
+
+# 'Link Status : ................................. Down'
+# 'L3 MAC Address................................. F48E.3841.9628'
+RE_DOTTED_FIELD = re.compile(
+    r'^(?P<label>[^.:]*?[^.:\s])\s*:?\s*\.{2,}\s*(?P<value>.*?)\s*$')
+# 'System Capabilities Supported: bridge, router'
+RE_COLON_FIELD = re.compile(r'^\s*(?P<label>[^:]+?)\s*:\s*(?P<value>.*?)\s*$')
+RE_CONFIG_DESCRIPTION = re.compile(r'^description:? "(.*)"$')
+RE_WORD = re.compile(r'\S+')
+
+# Characters a table header word may start before its column
+HEADER_SLACK = 2
+
+# Fields of 'show interfaces' used by get_interfaces, label -> key
+SHOW_INTERFACES_FIELDS = {
+    'Interface Name': 'name',
+    'Link Status': 'status',
+    'Port Speed': 'speed',
+    'L3 MAC Address': 'mac',
+}
+
+
+def iter_lines(output):
+    """Iterate over the lines of output without building a list of them."""
+    pos = 0
+    length = len(output)
+    while pos < length:
+        end = output.find('\n', pos)
+        if end == -1:
+            end = length
+        yield output[pos:end].rstrip('\r')
+        pos = end + 1
+
+
+def table_columns(separator):
+    """Return the start offsets of the columns of a dashed separator line.
+
+    '-------- ------------ ----' -> [0, 9, 22]
+    """
+    starts = []
+    previous = ' '
+    for i, char in enumerate(separator):
+        if char == '-' and previous == ' ':
+            starts.append(i)
+        previous = char
+    return starts
+
+
+def _is_separator(line):
+    return line.startswith('-') and not line.replace('-', '').strip()
+
+
+def split_columns(line, starts):
+    """Slice line at the column offsets of table_columns.
+
+    A value running past its column into the next one (no blank in front of
+    the next column) pushes the boundary to the next blank.
+    """
+    values = []
+    length = len(line)
+    begin = 0
+    for start in starts[1:]:
+        if begin > start:
+            # the previous value overflowed, this one is the next word
+            while begin < length and line[begin] == ' ':
+                begin += 1
+            end = line.find(' ', begin)
+        elif start < length and line[start - 1] != ' ':
+            end = line.find(' ', start)
+        else:
+            end = start
+        if end == -1 or end > length:
+            end = length
+        values.append(line[begin:end].strip())
+        begin = end
+    values.append(line[begin:].strip())
+    return values
+
+
+class TableLayout(object):
+    """Column layout of a table, derived once from its dashed separator line."""
+
+    def __init__(self, separator):
+        self.starts = table_columns(separator)
+        ends = self.starts[1:] + [None]
+        self._slices = [slice(a, b) for a, b in zip(self.starts, ends)]
+        # the blank in front of every column but the first
+        self._gaps = [start - 1 for start in self.starts[1:]]
+        self._min_length = self._gaps[-1] + 1 if self._gaps else 0
+
+    def split(self, line):
+        """Return the stripped column values of a row."""
+        if len(line) >= self._min_length:
+            for gap in self._gaps:
+                if line[gap] != ' ':
+                    break
+            else:
+                return [line[s].strip() for s in self._slices]
+        # short row or a value wider than its column
+        return split_columns(line, self.starts)
+
+    def header(self, lines):
+        """Join (possibly wrapped) header lines into one name per column.
+
+        A header word belongs to the column it starts in, with a tolerance
+        of HEADER_SLACK characters for headers not aligned to the dashes.
+        """
+        names = [[] for _ in self.starts]
+        for line in lines:
+            for word in RE_WORD.finditer(line):
+                column = bisect.bisect_right(
+                    self.starts, word.start() + HEADER_SLACK) - 1
+                names[max(column, 0)].append(word.group())
+        return tuple(' '.join(name) for name in names)
+
+
+def iter_table_rows(output):
+    """Yield (header, values) for every row of every table in output.
+
+    A table is a dashed separator line, the header lines directly above it
+    and the rows below it, up to the next blank or 'Total' line. The
+    column offsets are taken from the separator once (see TableLayout),
+    rows are then sliced at these offsets. Header lines are joined per
+    column::
+
+        Port    Description                    MTU   Admin
+        Channel                                      State
+        ------- ------------------------------ ----- -----
+        Po1                                    1518  Up
+
+    yields (('Port Channel', 'Description', 'MTU', 'Admin State'),
+    ['Po1', '', '1518', 'Up']).
+    """
+    above = []
+    layout = None
+    header = None
+    has_rows = False
+    for line in iter_lines(output):
+        if layout is None:
+            if _is_separator(line):
+                layout = TableLayout(line)
+                header = layout.header(above)
+                has_rows = False
+            elif line.strip():
+                above.append(line)
+            else:
+                above = []
+            continue
+        if not line.strip() or line.startswith('Total '):
+            if has_rows or line.strip():
+                layout = None
+                above = []
+            continue
+        has_rows = True
+        yield header, layout.split(line)
+
+
+def _identity(name):
+    return name
+
+
+# 'F48E.3841.9628', 'F4:8E:38:41:96:28', 'f4-8e-38-41-96-28'
+RE_MAC = re.compile(r'^(?:[0-9a-fA-F]{4}\.[0-9a-fA-F]{4}\.[0-9a-fA-F]{4}|'
+                    r'[0-9a-fA-F]{2}(?:[:-][0-9a-fA-F]{2}){5})$')
+
+
+def cast_mac(raw):
+    """Format a MAC address like napalm.base.helpers.mac: 'F4:8E:38:41:96:28'.
+
+    Only notations other than the usual three are passed to napalm, which
+    is not imported otherwise.
+    """
+    if RE_MAC.match(raw):
+        flat = raw.replace('.', '').replace(':', '').replace('-', '').upper()
+        return ':'.join((flat[0:2], flat[2:4], flat[4:6],
+                         flat[6:8], flat[8:10], flat[10:12]))
+    from napalm.base.helpers import mac
+    return mac(raw)
+
+
+# DNOS6 interface abbreviations, named like napalm's canonical_interface_name
+# given DNOS6_NAME_MAP
+INTERFACE_ABBREVIATIONS = {
+    'gi': 'GigabitEthernet',
+    'te': 'TenGigabitEthernet',
+    'fo': 'FortyGigabitEthernet',
+    'po': 'Port-channel',
+    'vl': 'Vlan',
+}
+# napalm names VLAN interfaces 'VLAN100', DNOS6 itself 'Vlan100'
+DNOS6_NAME_MAP = {'V': 'Vlan', 'Vl': 'Vlan', 'Vlan': 'Vlan', 'VLAN': 'Vlan'}
+# 'Gi1/0/1', 'Po 12', 'Vl100'
+RE_SHORT_INTERFACE = re.compile(r'^([A-Za-z]{2})\s*(\d[\d/.:]*)$')
+
+
+def canonical_dnos6_interface(name):
+    """Expand a DNOS6 interface name, 'Gi1/0/1' -> 'GigabitEthernet1/0/1'."""
+    m = RE_SHORT_INTERFACE.match(name)
+    if m is not None:
+        long_name = INTERFACE_ABBREVIATIONS.get(m.group(1).lower())
+        if long_name is not None:
+            return long_name + m.group(2)
+    from napalm.base.helpers import canonical_interface_name
+    return canonical_interface_name(name, addl_name_map=DNOS6_NAME_MAP)
+
+
+class InterfaceNames(dict):
+    """Memo of interface name -> name exposed by the getters.
+
+    Use the bound __getitem__ as canonical_int: names seen before cost a
+    single dict lookup. New names are expanded by canonical_dnos6_interface
+    if expand is set and kept as they are otherwise. The memo is emptied
+    once it holds size names.
+    """
+
+    def __init__(self, expand=True, size=4096):
+        super(InterfaceNames, self).__init__()
+        self.expand = expand
+        self.size = size
+
+    def __missing__(self, name):
+        if len(self) >= self.size:
+            self.clear()
+        value = canonical_dnos6_interface(name) if self.expand else name
+        self[name] = value
+        return value
+
+
+def mac_entry(vlan, mac, mac_type, interface, canonical_int=_identity):
+    """Return proper data for mac address fields."""
+    mac_type = mac_type.lower()
+    return {
+        'mac': cast_mac(mac),
+        'interface': canonical_int(interface),
+        'vlan': int(vlan),
+        'static': mac_type in ('management', 'static'),
+        'active': mac_type == 'dynamic',
+        'moves': -1,
+        'last_move': -1.0
+    }
+
+
+def iter_mac_address_rows(output):
+    """Yield (vlan, mac, type, port) of every 'show mac address-table' row.
+
+        Vlan     Mac Address           Type        Port
+        -------- --------------------- ----------- ---------------------
+        1        0025.90C2.88ED        Dynamic     Gi1/0/48
+    """
+    for _, values in iter_table_rows(output):
+        if len(values) == 4 and values[0].isdigit():
+            yield values
+
+
+def iter_mac_address_table(output, canonical_int=_identity):
+    """Yield the get_mac_address_table entries of 'show mac address-table'."""
+    for vlan, mac, mac_type, interface in iter_mac_address_rows(output):
+        yield mac_entry(vlan, mac, mac_type, interface, canonical_int)
+
+
+def arp_age(age):
+    """Convert an ARP age like '0h 1m 5s' to seconds, 'n/a' to -1."""
+    seconds = 0
+    for part in age.split():
+        unit = part[-1:]
+        if unit == 'h':
+            seconds += int(part[:-1]) * 3600
+        elif unit == 'm':
+            seconds += int(part[:-1]) * 60
+        elif unit == 's':
+            seconds += int(part[:-1])
+        else:
+            return -1
+    return seconds
+
+
+def arp_entry(ip, mac, interface, mac_type, age, canonical_int=_identity):
+    return {
+        'interface': canonical_int(interface),
+        'mac': cast_mac(mac),
+        'ip': ip,
+        'age': float(arp_age(age))
+    }
+
+
+def iter_arp_table(output, canonical_int=_identity):
+    """Yield the get_arp_table entries of 'show arp'.
+
+        IP Address      MAC Address        Interface  Type      Age
+        --------------- ------------------ ---------- --------- -----------
+        10.0.0.1        0025.90C2.88ED     Vl1        Dynamic   0h 1m 5s
+    """
+    for _, values in iter_table_rows(output):
+        if len(values) == 5:
+            yield arp_entry(*values, canonical_int=canonical_int)
+
+
+def parse_interface_config(config):
+    """Index the interface stanzas of a running-config in a single pass.
+
+    Returns a dictionary keyed by interface name, each value having the keys
+    'description' (string) and 'enabled' (boolean)::
+
+        !
+        interface Gi1/0/1
+        description "office1"
+        shutdown
+        exit
+    """
+    index = {}
+    current = None
+    for line in config.splitlines():
+        line = line.strip()
+        if current is None:
+            if line.startswith('interface '):
+                current = {'description': '', 'enabled': True}
+                index[line[10:].strip()] = current
+            continue
+        if line == 'exit':
+            current = None
+        elif line == 'shutdown':
+            current['enabled'] = False
+        elif line == 'no shutdown':
+            current['enabled'] = True
+        elif line.startswith('description'):
+            m = RE_CONFIG_DESCRIPTION.match(line)
+            if m is not None:
+                current['description'] = m.group(1)
+    return index
+
+
+def iter_dotted_blocks(output, fields, first_label):
+    """Sweep dotted 'Label....... value' output once, yielding one dict per block.
+
+    A new block starts at every line labelled ``first_label``. Only labels
+    present in ``fields`` (label -> key) are kept.
+    """
+    block = None
+    for line in output.splitlines():
+        m = RE_DOTTED_FIELD.match(line)
+        if m is None:
+            continue
+        label = m.group('label')
+        if label == first_label:
+            if block is not None:
+                yield block
+            block = {}
+        if block is not None and label in fields:
+            block[fields[label]] = m.group('value')
+    if block is not None:
+        yield block
+
+
+def iter_show_interfaces(output):
+    """Yield the fields of SHOW_INTERFACES_FIELDS for every 'show interfaces' block."""
+    return iter_dotted_blocks(output, SHOW_INTERFACES_FIELDS, 'Interface Name')
+
+
+# Counters of 'show interfaces', label -> get_interfaces_counters key
+SHOW_INTERFACES_COUNTERS = {
+    'Interface Name': 'name',
+    'Unicast Packets Received': 'rx_unicast_packets',
+    'Multicast Packets Received': 'rx_multicast_packets',
+    'Broadcast Packets Received': 'rx_broadcast_packets',
+    'Total Packets Received with MAC Errors': 'rx_errors',
+    'Total Received Packets Not Forwarded': 'rx_discards',
+    'Unicast Packets Transmitted': 'tx_unicast_packets',
+    'Multicast Packets Transmitted': 'tx_multicast_packets',
+    'Broadcast Packets Transmitted': 'tx_broadcast_packets',
+    'Total Transmit Errors': 'tx_errors',
+    'Total Transmit Packets Discarded': 'tx_discards',
+}
+
+# Counters of NAPALM not available on DNOS6
+UNAVAILABLE_COUNTERS = ('rx_octets', 'tx_octets')
+
+
+def parse_interfaces_counters(output, canonical_int=_identity):
+    """Build the get_interfaces_counters result from 'show interfaces' in one sweep.
+
+    Octet counters are not part of the output and are set to -1.
+    """
+    counters = {}
+    for block in iter_dotted_blocks(output, SHOW_INTERFACES_COUNTERS,
+                                    'Interface Name'):
+        name = block.pop('name')
+        iface = dict((key, -1) for key in UNAVAILABLE_COUNTERS)
+        for key, value in block.items():
+            iface[key] = int(value) if value.isdigit() else -1
+        counters[canonical_int(name)] = iface
+    return counters
+
+
+def counter_rates(previous, current, seconds):
+    """Per second rates of the counters between two get_interfaces_counters results.
+
+    Rates are None for unavailable counters and for counters which went
+    backwards, e.g. after they were cleared.
+    """
+    rates = {}
+    for name, iface in current.items():
+        before = previous.get(name)
+        if before is None:
+            continue
+        iface_rates = rates[name] = {}
+        for key, value in iface.items():
+            old = before.get(key, -1)
+            if value < 0 or old < 0 or value < old or seconds <= 0:
+                iface_rates[key] = None
+            else:
+                iface_rates[key] = (value - old) / float(seconds)
+    return rates
+
+
+def parse_interfaces(config, output, canonical_int=_identity):
+    """Build the get_interfaces result from 'show running-config' and 'show interfaces'."""
+    return build_interfaces(parse_interface_config(config), output, canonical_int)
+
+
+def build_interfaces(config_ifaces, output, canonical_int=_identity):
+    """Like parse_interfaces, taking the result of parse_interface_config."""
+    iface_list = []
+    for iface in iter_show_interfaces(output):
+        name = iface['name']
+        speed = iface.get('speed', 'Unknown')
+        iface_config = config_ifaces.get(name)
+        if iface_config is None:
+            description, enabled = '', True
+        else:
+            description = iface_config['description']
+            enabled = iface_config['enabled']
+        if speed == 'Unknown':
+            speed = 0
+        iface_list.append({canonical_int(name): {
+            'is_up': iface.get('status') == 'Up',
+            'is_enable': enabled,
+            'description': description,
+            'last_flapped': -1,
+            'speed': int(speed),
+            'mac_address': cast_mac(iface['mac'])}
+        })
+    return iface_list
+
+
+def _find_column(header, keyword):
+    for i, name in enumerate(header):
+        if keyword in name:
+            return i
+    return None
+
+
+def parse_interfaces_status(output, mac_address, canonical_int=_identity):
+    """Build the get_interfaces result from 'show interfaces status'.
+
+    The table has no MAC addresses, mac_address is used for all interfaces.
+    Without a link state column an interface is up when it negotiated a
+    speed. Port-channel rows have neither, so they are always down.
+
+        Port      Description                    Duplex Speed   Neg  MTU   Admin
+                                                                           State
+        --------- ------------------------------ ------ ------- ---- ----- -----
+        Gi1/0/1   idrac6.vmhost1                 Full   100     Auto 1518  Up
+    """
+    mac_address = cast_mac(mac_address) if mac_address else ''
+    columns = {}
+    iface_list = []
+    for header, values in iter_table_rows(output):
+        if header not in columns:
+            columns[header] = [_find_column(header, keyword) for keyword in
+                               ('Description', 'Speed', 'Admin', 'Link')]
+        descr_col, speed_col, admin_col, link_col = columns[header]
+        speed = values[speed_col] if speed_col is not None else ''
+        if link_col is not None:
+            is_up = values[link_col] == 'Up'
+        else:
+            is_up = speed not in ('', 'Unknown')
+        iface_list.append({canonical_int(values[0]): {
+            'is_up': is_up,
+            'is_enable': admin_col is None or values[admin_col] == 'Up',
+            'description': values[descr_col] if descr_col is not None else '',
+            'last_flapped': -1,
+            'speed': int(speed) if speed.isdigit() else 0,
+            'mac_address': mac_address}
+        })
+    return iface_list
+
+
+def parse_lldp_neighbors(output, canonical_int=_identity):
+    """Build the get_lldp_neighbors result from 'show lldp remote-device all'.
+
+        Local
+        Interface RemID   Chassis ID          Port ID           System Name
+        --------- ------- ------------------- ----------------- -----------------
+        Gi1/0/1   2       00:1E:C9:DE:B4:A5   Gi1/0/48          switch2
+    """
+    result = collections.defaultdict(list)
+    for _, values in iter_table_rows(output):
+        if len(values) != 5:
+            continue
+        iface, _, _, portid, systemname = values
+        result[canonical_int(iface)].append({'hostname': systemname or None,
+                              'port': portid
+                              })
+    return dict(result)
+
+
+# '  free  1048281088' / ' alloc   895270912' of 'show proc cpu'
+RE_MEMORY = re.compile(r'^\s*(alloc|free)\s+(\d+)\s*$', flags=re.M)
+# ' Total CPU Utilization    9.26%    9.75%    9.72%'
+RE_TOTAL_CPU = re.compile(
+    r'Total CPU Utilization\s+([\d.]+)%\s+([\d.]+)%\s+([\d.]+)%')
+# 'MAC Temperature Value.......... 47', older firmware
+RE_TEMP_VALUE = re.compile(r'^\s*(.*?) Temperature Value\W*?(-?\d+)', flags=re.M)
+# Sensor states of 'show system temperature' not worth an alert
+TEMPERATURE_OK = ('good', 'ok', 'normal', 'not present')
+TEMPERATURE_CRITICAL = ('critical', 'shutdown', 'failed', 'failure')
+
+
+def parse_cpu_memory(output):
+    """Return (cpu %usage over 1 minute, used bytes, free bytes) from 'show proc cpu'."""
+    memory = {'alloc': 0, 'free': 0}
+    for m in RE_MEMORY.finditer(output):
+        memory[m.group(1)] = int(m.group(2))
+    m = RE_TOTAL_CPU.search(output)
+    cpu = float(m.group(2)) if m is not None else 0.0
+    return cpu, memory['alloc'], memory['free']
+
+
+def iter_temperatures(output):
+    """Yield (sensor, celsius, is_alert, is_critical) from 'show system temperature'.
+
+    Sensors are named '<unit> <description>':
+
+        Unit     Description       Temperature    Status
+                                    (Celsius)
+        ----     -----------       -----------    ------
+        1        MAC               47             Good
+    """
+    found = False
+    for header, values in iter_table_rows(output):
+        temp = _find_column(header, 'Temp')
+        if temp is None:
+            continue
+        try:
+            celsius = float(values[temp])
+        except (IndexError, ValueError):
+            continue
+        status_col = _find_column(header, 'Status')
+        status = ''
+        if status_col is not None and status_col < len(values):
+            status = values[status_col].lower()
+        found = True
+        yield (' '.join(v for v in values[:temp] if v),
+               celsius,
+               bool(status) and status not in TEMPERATURE_OK,
+               status in TEMPERATURE_CRITICAL)
+    if not found:
+        for m in RE_TEMP_VALUE.finditer(output):
+            yield m.group(1).strip(), float(m.group(2)), False, False
+
+
+def parse_environment(cpu_output, temp_output):
+    """Build the get_environment result from 'show proc cpu' and 'show system temperature'.
+
+    power and fan are currently not implemented
+    cpu is using 1-minute average
+    cpu hard-coded to cpu0 (i.e. only a single CPU)
+    """
+    cpu, used_mem, avail_mem = parse_cpu_memory(cpu_output)
+    environment = {
+        'cpu': {0: {'%usage': cpu}},
+        'memory': {'used_ram': used_mem,
+                   'available_ram': used_mem + avail_mem},
+        'temperature': {},
+    }
+
+    for sensor, celsius, is_alert, is_critical in iter_temperatures(temp_output):
+        environment['temperature'][sensor] = {
+            'is_alert': is_alert or is_critical,
+            'is_critical': is_critical,
+            'temperature': celsius}
+    if not environment['temperature']:
+        environment['temperature']['invalid'] = {
+            'is_alert': False, 'is_critical': False, 'temperature': -1.0}
+
+    # Initialize 'power' and 'fan' to default values (not implemented)
+    environment['power'] = {'invalid': {
+        'status': True, 'output': -1.0, 'capacity': -1.0}}
+    environment['fans'] = {'invalid': {'status': True}}
+
+    return environment
+
+
+# 'System Up Time: 12 days, 04h:21m:06s'
+RE_UPTIME = re.compile(r'(?:(\d+) days?,\s*)?(\d+)h:(\d+)m:(\d+)s')
+
+
+def _colon_fields(output):
+    fields = {}
+    for line in iter_lines(output):
+        m = RE_COLON_FIELD.match(line)
+        if m is not None:
+            fields.setdefault(m.group('label'), m.group('value'))
+    return fields
+
+
+def parse_facts(version, system, hosts, status, canonical_int=_identity):
+    """Build the get_facts result.
+
+    Takes the outputs of 'show version', 'show system', 'show hosts' and
+    'show interfaces status'.
+    """
+    version_fields = {}
+    for line in iter_lines(version):
+        m = RE_DOTTED_FIELD.match(line)
+        if m is not None:
+            version_fields[m.group('label')] = m.group('value')
+    os_version = ''
+    for header, values in iter_table_rows(version):
+        column = _find_column(header, 'active')
+        if column is not None:
+            os_version = values[column]
+            break
+
+    system_fields = _colon_fields(system)
+    uptime = -1.0
+    m = RE_UPTIME.search(system_fields.get('System Up Time', ''))
+    if m is not None:
+        days, hours, minutes, seconds = [int(g or 0) for g in m.groups()]
+        uptime = float(((days * 24 + hours) * 60 + minutes) * 60 + seconds)
+
+    hosts_fields = _colon_fields(hosts)
+    hostname = hosts_fields.get('Host name') or system_fields.get('System Name', '')
+    domain = hosts_fields.get('Default domain', '')
+    fqdn = hostname
+    if domain and ' ' not in domain:
+        fqdn = '%s.%s' % (hostname, domain)
+
+    return {
+        'uptime': uptime,
+        'vendor': 'Dell',
+        'os_version': os_version,
+        'serial_number': version_fields.get('Serial Number', ''),
+        'model': version_fields.get('System Model ID', ''),
+        'hostname': hostname,
+        'fqdn': fqdn,
+        'interface_list': [canonical_int(values[0]) for _, values
+                           in iter_table_rows(status)],
+    }
+
+
+def parse_ntp_peers(output):
+    """Build the get_ntp_peers result from 'show sntp server'."""
+    entries = dict()
+    for i in re.findall(r'Host Address:\s(\S+)', output):
+        entries[i] = {}
+    return entries
+
+
+# DNOS6 capability names -> NAPALM capability names
+LLDP_CAPABILITIES = {
+    'other': 'other',
+    'repeater': 'repeater',
+    'bridge': 'bridge',
+    'wlan access point': 'wlan-access-point',
+    'router': 'router',
+    'telephone': 'telephone',
+    'docsis cable device': 'docsis-cable-device',
+    'station only': 'station',
+}
+
+
+def _lldp_capabilities(value):
+    caps = []
+    for cap in value.split(','):
+        cap = cap.strip().lower()
+        if cap:
+            caps.append(LLDP_CAPABILITIES.get(cap, cap))
+    return caps
+
+
+def _lldp_neighbor_detail(fields):
+    return {
+        'parent_interface': '',
+        'remote_chassis_id': fields.get('Chassis ID', ''),
+        'remote_system_name': fields.get('System Name', ''),
+        'remote_port': fields.get('Port ID', ''),
+        'remote_port_description': fields.get('Port Description', ''),
+        'remote_system_description': fields.get('System Description', ''),
+        'remote_system_capab': _lldp_capabilities(
+            fields.get('System Capabilities Supported', '')),
+        'remote_system_enable_capab': _lldp_capabilities(
+            fields.get('System Capabilities Enabled', '')),
+    }
+
+
+def iter_lldp_neighbor_detail(output, interface=''):
+    """Split 'show lldp remote-device detail' output into neighbor records.
+
+    Yields (local interface, neighbor detail) tuples in one pass. The output
+    may hold any number of interfaces, each introduced by a
+    'Local Interface:' line, and any number of neighbors per interface. A
+    label seen twice within a record starts the next neighbor. Records
+    without a 'Local Interface:' line are attributed to ``interface``.
+    """
+    local_iface = interface
+    fields = {}
+    for line in output.splitlines():
+        m = RE_COLON_FIELD.match(line)
+        if m is None:
+            continue
+        label, value = m.group('label'), m.group('value')
+        if label == 'Local Interface' or label in fields:
+            if 'Chassis ID' in fields:
+                yield local_iface, _lldp_neighbor_detail(fields)
+            fields = {}
+            if label == 'Local Interface':
+                local_iface = value
+                continue
+        fields[label] = value
+    if 'Chassis ID' in fields:
+        yield local_iface, _lldp_neighbor_detail(fields)
+
+
+def parse_lldp_neighbor_detail(output, interface='', canonical_int=_identity):
+    """Build the get_lldp_neighbor_detail result from 'show lldp remote-device detail'."""
+    result = collections.defaultdict(list)
+    for iface, detail in iter_lldp_neighbor_detail(output, interface):
+        result[canonical_int(iface)].append(detail)
+    return dict(result)
+
+
+# -rwx   11408     Feb 22 2016 10:46:06        startup-config
+RE_DIR_FILE = re.compile(
+    r'^\s*(?P<attr>[-d][-rwx]{3})\s+(?P<size>\d+)\s+.*\d\d:\d\d:\d\d\s+(?P<name>\S+)\s*$',
+    flags=re.M)
+RE_DIR_FREE = re.compile(r'^\s*Bytes Free:?\s*(\d+)', flags=re.M)
+
+
+def parse_dir(output):
+    """Return ({file name: size in bytes}, free bytes or None) from 'dir'."""
+    files = dict((m.group('name'), int(m.group('size')))
+                 for m in RE_DIR_FILE.finditer(output)
+                 if not m.group('attr').startswith('d'))
+    m = RE_DIR_FREE.search(output)
+    return files, int(m.group(1)) if m is not None else None
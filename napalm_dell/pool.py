@@ -0,0 +1,90 @@
+"""Several CLI sessions to one device, used by DNOS6Driver in parallel.
+
+Enabled with ``optional_args={'sessions': N}``. The driver then opens N
+connections to the switch; every command borrows one of them for its
+duration, so independent commands of a getter and getters called from
+different threads run side by side instead of queueing behind one slow
+CLI.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import contextlib
+from concurrent import futures
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class SessionPool(object):
+    """A fixed set of connections to one device, lent out one at a time."""
+
+    def __init__(self, connections):
+        self.connections = list(connections)
+        self._idle = queue.Queue()
+        for connection in self.connections:
+            self._idle.put(connection)
+        self._executor = None
+
+    @classmethod
+    def open(cls, connect, size):
+        """Call connect() size times in parallel and pool the connections."""
+        with futures.ThreadPoolExecutor(max_workers=size) as executor:
+            pending = [executor.submit(connect) for _ in range(size)]
+            futures.wait(pending)
+        connections = [f.result() for f in pending if f.exception() is None]
+        if len(connections) < size:
+            for connection in connections:
+                connection.disconnect()
+            # re-raise the first failure
+            next(f for f in pending if f.exception() is not None).result()
+        return cls(connections)
+
+    def __len__(self):
+        return len(self.connections)
+
+    @contextlib.contextmanager
+    def session(self):
+        """Borrow an idle connection, waiting for one if all are busy."""
+        connection = self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def map(self, func, items):
+        """Return [func(connection, item) for item in items], run in parallel."""
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(
+                max_workers=len(self.connections))
+
+        def call(item):
+            with self.session() as connection:
+                return func(connection, item)
+        return list(self._executor.map(call, items))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for connection in self.connections:
+            try:
+                connection.disconnect()
+            except Exception:
+                pass
+        self.connections = []
@@ -0,0 +1,89 @@
+"""Offline transport answering commands from captured outputs.
+
+Selected with ``optional_args={'transport': 'replay'}``. Outputs are looked
+up in ``replay_dir`` (default: the bundled example_output directory), one
+file per command, named after the command with spaces replaced by
+underscores, e.g. ``show_interfaces_status.txt``. A capture whose first line
+is the echoed command (``show mac address-table``) is also found under that
+command, and the echo is stripped.
+
+``replay_latency`` and ``replay_jitter`` (seconds) delay every command by
+latency plus a uniformly distributed amount of up to jitter.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import io
+import os
+import random
+import time
+
+DEFAULT_REPLAY_DIR = os.path.join(os.path.dirname(__file__), 'example_output')
+
+INVALID_INPUT = "\n% Invalid input detected at '^' marker.\n"
+
+
+def _normalize(command):
+    return ' '.join(command.split())
+
+
+class ReplayConnection(object):
+    """Stand-in for the netmiko connection, see the module documentation."""
+
+    def __init__(self, replay_dir=None, latency=0.0, jitter=0.0):
+        self.replay_dir = replay_dir or DEFAULT_REPLAY_DIR
+        self.latency = latency
+        self.jitter = jitter
+        self._outputs = self._load(self.replay_dir)
+        self._alive = True
+
+    @staticmethod
+    def _load(replay_dir):
+        outputs = {}
+        for fname in sorted(os.listdir(replay_dir)):
+            path = os.path.join(replay_dir, fname)
+            if not os.path.isfile(path):
+                continue
+            with io.open(path, 'rt', encoding='utf-8') as fobj:
+                output = fobj.read()
+            command = _normalize(os.path.splitext(fname)[0].replace('_', ' '))
+            first, _, rest = output.partition('\n')
+            if first.startswith('show '):
+                # drop the command echo included in the capture
+                output = rest
+                outputs.setdefault(_normalize(first), output)
+            outputs.setdefault(command, output)
+        return outputs
+
+    def send_command(self, command, **kwargs):
+        delay = self.latency
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        return self._outputs.get(_normalize(command), INVALID_INPUT)
+
+    def enable(self):
+        pass
+
+    def write_channel(self, out_data):
+        pass
+
+    def is_alive(self):
+        return self._alive
+
+    def disconnect(self):
+        self._alive = False
@@ -0,0 +1,181 @@
+"""Background sampling of CPU, memory and temperature of a DNOS6 switch.
+
+Example::
+
+    sampler = driver.start_environment_sampler(interval=5, size=720)
+    ...
+    sampler.summary()['cpu']   # {'count': 720, 'min': 3.1, 'max': 41.7, 'avg': 9.4}
+    driver.stop_environment_sampler()
+
+Every series is a RingBuffer of doubles, the last ``size`` samples are kept
+without allocating per sample objects.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import math
+import threading
+import time
+from array import array
+
+from napalm_dell import parsers
+
+_clock = getattr(time, 'monotonic', time.time)
+
+SERIES = ('time', 'cpu', 'used_ram', 'available_ram', 'temperature')
+
+
+class RingBuffer(object):
+    """Fixed size buffer of floats keeping the last ``size`` values appended.
+
+    NaN marks a missing value: it keeps the buffers of a sampler aligned
+    and is ignored by min, max and avg.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._values = array('d', [0.0] * size)
+        self._next = 0
+        self._count = 0
+        self._sum = 0.0
+        # number of stored NaN values
+        self.missing = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        if self._count == self.size:
+            old = self._values[self._next]
+            if math.isnan(old):
+                self.missing -= 1
+            else:
+                self._sum -= old
+        else:
+            self._count += 1
+        self._values[self._next] = value
+        if math.isnan(value):
+            self.missing += 1
+        else:
+            self._sum += value
+        self._next = (self._next + 1) % self.size
+
+    def values(self):
+        """Return the stored values, oldest first, as an array."""
+        if self._count < self.size:
+            return self._values[:self._count]
+        return self._values[self._next:] + self._values[:self._next]
+
+    def last(self):
+        if not self._count:
+            return None
+        return self._values[self._next - 1]
+
+    def _stored(self):
+        # order does not matter for min and max
+        values = self._values
+        if self._count < self.size:
+            values = values[:self._count]
+        if self.missing:
+            values = [v for v in values if not math.isnan(v)]
+        return values
+
+    def min(self):
+        return min(self._stored()) if self._count > self.missing else None
+
+    def max(self):
+        return max(self._stored()) if self._count > self.missing else None
+
+    def avg(self):
+        count = self._count - self.missing
+        return self._sum / count if count else None
+
+
+class EnvironmentSampler(object):
+    """Polls 'show proc cpu' and 'show system temperature' every interval seconds.
+
+    The temperature series holds the hottest sensor of each sample, NaN
+    if the output has no temperature.
+    Sampling errors do not stop the sampler, the last one is kept in
+    last_error.
+    """
+
+    def __init__(self, driver, interval=5.0, size=720):
+        self.driver = driver
+        self.interval = interval
+        self.series = dict((name, RingBuffer(size)) for name in SERIES)
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """Take one sample now, bypassing the command cache of the driver."""
+        cpu_output, temp_output = self.driver._send_commands(
+            ['show proc cpu', 'show system temperature'], use_cache=False)
+        cpu, used, free = parsers.parse_cpu_memory(cpu_output)
+        temperatures = [celsius for _, celsius, _, _
+                        in parsers.iter_temperatures(temp_output)]
+        temperature = max(temperatures) if temperatures else float('nan')
+        series = self.series
+        with self._lock:
+            series['time'].append(time.time())
+            series['cpu'].append(cpu)
+            series['used_ram'].append(used)
+            series['available_ram'].append(used + free)
+            series['temperature'].append(temperature)
+
+    def _run(self):
+        while not self._stop.is_set():
+            start = _clock()
+            try:
+                self.sample()
+            except Exception as e:
+                self.last_error = e
+            self._stop.wait(max(self.interval - (_clock() - start), 0.0))
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run,
+                                            name='dnos6-environment-sampler')
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def __len__(self):
+        return len(self.series['time'])
+
+    def summary(self):
+        """Return count, min, max and avg of every series but time.
+
+        Missing values are not counted.
+        """
+        with self._lock:
+            return dict((name, {'count': len(ring) - ring.missing,
+                                'min': ring.min(),
+                                'max': ring.max(), 'avg': ring.avg()})
+                        for name, ring in self.series.items() if name != 'time')
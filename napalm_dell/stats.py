@@ -0,0 +1,169 @@
+"""Per-command and per-getter timing statistics of the DNOS6 driver.
+
+Enabled with ``optional_args={'collect_stats': True}`` or by passing a
+``stats_callback``, which is called with a dict for every command and
+getter, e.g.::
+
+    {'type': 'command', 'command': 'show arp', 'seconds': 0.42,
+     'bytes': 81234, 'cached': False}
+    {'type': 'getter', 'getter': 'get_arp_table', 'seconds': 0.61,
+     'parse_seconds': 0.19}
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import bisect
+import functools
+import threading
+import time
+
+_clock = getattr(time, 'monotonic', time.time)
+
+# Upper bounds of the histogram buckets, seconds and bytes respectively
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram(object):
+    """Fixed bucket histogram, the last bucket counting values above all bounds.
+
+    Not thread safe on its own, Stats guards its histograms with a lock.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else None,
+            'buckets': list(zip(self.bounds + (float('inf'), ), self.counts)),
+        }
+
+
+class Stats(object):
+    """Collects the command and getter measurements of one driver."""
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.commands = {}
+        self.getters = {}
+        # session pool workers, fleet threads and the sampler record
+        # concurrently
+        self._lock = threading.Lock()
+        # per thread seconds spent waiting for commands, see command_seconds
+        self._local = threading.local()
+
+    @property
+    def command_seconds(self):
+        """Seconds the calling thread has waited for commands so far."""
+        return getattr(self._local, 'command_seconds', 0.0)
+
+    def record_command(self, command, seconds, nbytes, cached=False):
+        self._local.command_seconds = self.command_seconds + seconds
+        with self._lock:
+            entry = self.commands.get(command)
+            if entry is None:
+                entry = self.commands[command] = {
+                    'seconds': Histogram(TIME_BUCKETS),
+                    'bytes': Histogram(SIZE_BUCKETS),
+                    'cached': 0,
+                }
+            entry['seconds'].add(seconds)
+            entry['bytes'].add(nbytes)
+            if cached:
+                entry['cached'] += 1
+        if self.callback is not None:
+            self.callback({'type': 'command', 'command': command,
+                           'seconds': seconds, 'bytes': nbytes,
+                           'cached': cached})
+
+    def record_getter(self, getter, seconds, parse_seconds):
+        with self._lock:
+            entry = self.getters.get(getter)
+            if entry is None:
+                entry = self.getters[getter] = {
+                    'seconds': Histogram(TIME_BUCKETS),
+                    'parse_seconds': Histogram(TIME_BUCKETS),
+                }
+            entry['seconds'].add(seconds)
+            entry['parse_seconds'].add(parse_seconds)
+        if self.callback is not None:
+            self.callback({'type': 'getter', 'getter': getter,
+                           'seconds': seconds, 'parse_seconds': parse_seconds})
+
+    def snapshot(self):
+        with self._lock:
+            commands = {}
+            for command, entry in self.commands.items():
+                commands[command] = {
+                    'seconds': entry['seconds'].snapshot(),
+                    'bytes': entry['bytes'].snapshot(),
+                    'cached': entry['cached'],
+                }
+            getters = {}
+            for getter, entry in self.getters.items():
+                getters[getter] = {
+                    'seconds': entry['seconds'].snapshot(),
+                    'parse_seconds': entry['parse_seconds'].snapshot(),
+                }
+        return {'commands': commands, 'getters': getters}
+
+    def reset(self):
+        with self._lock:
+            self.commands.clear()
+            self.getters.clear()
+
+
+def instrumented(getter):
+    """Record the wall and parse time of a driver getter when stats are enabled.
+
+    Parse time is the wall time minus the time the calling thread spent
+    waiting for commands during the call, so commands of other threads do
+    not count. A nested getter's parse time is part of the outer one's.
+    """
+    @functools.wraps(getter)
+    def wrapper(self, *args, **kwargs):
+        stats = self._stats
+        if stats is None:
+            return getter(self, *args, **kwargs)
+        start = _clock()
+        command_seconds = stats.command_seconds
+        try:
+            return getter(self, *args, **kwargs)
+        finally:
+            seconds = _clock() - start
+            parse_seconds = seconds - (stats.command_seconds - command_seconds)
+            stats.record_getter(getter.__name__, seconds, max(parse_seconds, 0.0))
+    return wrapper
@@ -0,0 +1,208 @@
+"""Synthetic DNOS6 command outputs for large stacks.
+
+The generators mimic the layout of the captures in example_output, scaled to
+any number of stack members and table sizes. write_replay_dir() stores them
+in a directory usable with the replay transport.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import io
+import os
+
+GI_PORTS = 48
+TE_PORTS = 2
+
+SHOW_INTERFACES_BLOCK = """\
+Interface Name : .............................. {name}
+SOC Hardware Info :............................ BCM56340_A0
+Link Status : ................................. {status}
+VLAN Membership Mode: ......................... Access Mode
+VLAN Membership: .............................. {vlan}
+MTU Size : .................................... 1518
+Port Mode [Duplex] : .......................... {duplex}
+Port Speed : .................................. {speed}
+Link Debounce Flaps : ......................... 0
+Auto-Negotation Status : ...................... Auto
+Burned MAC Address : .......................... F48E.3841.9627
+L3 MAC Address................................. F48E.3841.9628
+Sample load interval : ........................ 300
+Received Input Rate Bits/Sec : ................ {n}
+Received Input Rate Packets/Sec : ............. {n}
+Transmitted Input Rate Bits/Sec : ............. {n}
+Transmitted Input Rate Packets/Sec : .......... {n}
+Total Packets Received Without Errors.......... {n}
+Unicast Packets Received....................... {n}
+Multicast Packets Received..................... {n}
+Broadcast Packets Received..................... {n}
+Total Packets Received with MAC Errors......... 0
+Jabbers Received............................... 0
+Fragments/Undersize Received................... 0
+Alignment Errors............................... 0
+FCS Errors..................................... 0
+Overruns....................................... 0
+Total Received Packets Not Forwarded........... 0
+Total Packets Transmitted Successfully......... {n}
+Unicast Packets Transmitted.................... {n}
+Multicast Packets Transmitted.................. {n}
+Broadcast Packets Transmitted.................. {n}
+Transmit Packets Discarded..................... 0
+Total Transmit Errors.......................... 0
+Total Transmit Packets Discarded............... 0
+Single Collision Frames........................ 0
+Multiple Collision Frames...................... 0
+Excessive Collision Frames..................... 0
+"""
+
+
+def port_names(members=1):
+    """Return the front panel port names of a stack with the given number of members."""
+    names = []
+    for unit in range(1, members + 1):
+        names.extend('Gi%d/0/%d' % (unit, port) for port in range(1, GI_PORTS + 1))
+        names.extend('Te%d/0/%d' % (unit, port) for port in range(1, TE_PORTS + 1))
+    return names
+
+
+def _is_up(index):
+    return index % 3 != 0
+
+
+def _mac(index):
+    mac = '%012X' % (0x00259000000 + index)
+    return '%s.%s.%s' % (mac[0:4], mac[4:8], mac[8:12])
+
+
+def show_interfaces(members=1):
+    blocks = []
+    for i, name in enumerate(port_names(members)):
+        up = _is_up(i)
+        blocks.append(SHOW_INTERFACES_BLOCK.format(
+            name=name, status='Up' if up else 'Down', vlan=1 + i % 64,
+            duplex='Full' if up else 'N/A',
+            speed=('10000' if name.startswith('Te') else '1000') if up else 'Unknown',
+            n=i * 1000 if up else 0))
+    return '\n'.join(blocks)
+
+
+def show_interfaces_status(members=1):
+    lines = [
+        '',
+        'Port      Description                    Duplex Speed   Neg  MTU   Admin',
+        '                                                                   State',
+        '--------- ------------------------------ ------ ------- ---- ----- -----',
+    ]
+    for i, name in enumerate(port_names(members)):
+        up = _is_up(i)
+        speed = ('10000' if name.startswith('Te') else '1000') if up else 'Unknown'
+        lines.append('%-9s %-30s %-6s %-7s %-4s %-5s %s' % (
+            name, 'port%d' % i if i % 2 else '', 'Full' if up else 'N/A', speed,
+            'Auto', '1518', 'Down' if i % 7 == 0 else 'Up'))
+    return '\n'.join(lines) + '\n'
+
+
+def show_running_config(members=1):
+    lines = ['!Current Configuration:', '!System Description "Dell Networking N2048P"',
+             '!', 'hostname "synthetic"']
+    for i, name in enumerate(port_names(members)):
+        lines.extend(['!', 'interface %s' % name])
+        if i % 2:
+            lines.append('description "port%d"' % i)
+        lines.append('switchport access vlan %d' % (1 + i % 64))
+        if i % 7 == 0:
+            lines.append('shutdown')
+        lines.append('exit')
+    lines.extend(['!', 'exit'])
+    return '\n'.join(lines) + '\n'
+
+
+def show_mac_address_table(entries=1000, members=1):
+    ports = port_names(members)
+    lines = [
+        '',
+        'Aging time is 300 Sec',
+        '',
+        'Vlan     Mac Address           Type        Port',
+        '-------- --------------------- ----------- ---------------------',
+    ]
+    for i in range(entries):
+        lines.append('%-8d %-21s %-11s %s' % (
+            1 + i % 64, _mac(i), 'Dynamic', ports[i % len(ports)]))
+    lines.extend(['', 'Total MAC Addresses in use: %d' % entries, ''])
+    return '\n'.join(lines)
+
+
+def show_arp(entries=1000):
+    lines = [
+        '',
+        'Age Time (seconds)............................. 1200',
+        'Response Time (seconds)........................ 1',
+        'Retries........................................ 4',
+        'Cache Size..................................... 6144',
+        'Dynamic Renew Mode ............................ Disable',
+        'Total Entry Count Current / Peak .............. %d / %d' % (entries, entries),
+        'Static Entry Count Configured / Active / Max .. 0 / 0 / 128',
+        '',
+        'IP Address      MAC Address        Interface  Type      Age',
+        '--------------- ------------------ ---------- --------- -----------',
+    ]
+    for i in range(entries):
+        lines.append('%-15s %-18s %-10s %-9s %s' % (
+            '10.%d.%d.%d' % (i >> 16 & 255, i >> 8 & 255, i & 255), _mac(i),
+            'Vl%d' % (1 + i % 64), 'Dynamic', '0h %dm %ds' % (i % 60, i % 59)))
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def show_lldp_remote_device_all(members=1):
+    lines = [
+        '',
+        'LLDP Remote Device Summary',
+        '',
+        'Local',
+        'Interface RemID   Chassis ID          Port ID           System Name',
+        '--------- ------- ------------------- ----------------- -----------------',
+    ]
+    for i, name in enumerate(port_names(members)):
+        if not _is_up(i):
+            continue
+        lines.append('%-9s %-7d %-19s %-17s %s' % (
+            name, i + 1, _mac(i).replace('.', ''), 'Gi1/0/%d' % (1 + i % 48),
+            'edge%d' % i))
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def outputs(members=1, macs=1000, arps=1000):
+    """Return a dict of command -> synthetic output."""
+    return {
+        'show interfaces': show_interfaces(members),
+        'show interfaces status': show_interfaces_status(members),
+        'show running-config': show_running_config(members),
+        'show mac address-table': show_mac_address_table(macs, members),
+        'show arp': show_arp(arps),
+        'show lldp remote-device all': show_lldp_remote_device_all(members),
+    }
+
+
+def write_replay_dir(path, members=1, macs=1000, arps=1000):
+    """Write the synthetic outputs to path in the layout of the replay transport."""
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    for command, output in outputs(members, macs, arps).items():
+        fname = os.path.join(path, command.replace(' ', '_') + '.txt')
+        with io.open(fname, 'wt', encoding='utf-8') as fobj:
+            fobj.write(output)
@@ -0,0 +1,103 @@
+"""Configuration file transfer helpers of the DNOS6 driver.
+
+Candidate configurations are copied to the switch by SCP. DNOS6 has no
+command to hash a file, so a transfer is verified by comparing the file
+size 'dir' reports with the local one. Configurations given as strings or
+iterables of lines are written to a temporary file first.
+"""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import io
+import os
+import tempfile
+import uuid
+
+from netmiko.scp_handler import BaseFileTransfer
+
+from napalm.base.utils import py23_compat
+
+from napalm_dell import parsers
+
+
+def write_tmp_file(config):
+    """Write config, a string or an iterable of lines with their line ends, to a temporary file.
+
+    Returns the file name.
+    """
+    filename = os.path.join(tempfile.gettempdir(),
+                            py23_compat.text_type(uuid.uuid4()))
+    if isinstance(config, py23_compat.string_types):
+        config = [config]
+    with io.open(filename, 'wt', encoding='utf-8') as fobj:
+        for line in config:
+            fobj.write(line)
+    return filename
+
+
+class DNOS6FileTransfer(BaseFileTransfer):
+    """SCP transfer reading the DNOS6 'dir' output.
+
+    netmiko's FileTransfer factory has no dell_dnos6 entry and the generic
+    base class parses IOS output. Files are compared by size, DNOS6 cannot
+    hash them.
+    """
+
+    def _dir(self):
+        output = self.ssh_ctl_chan.send_command('dir')
+        return parsers.parse_dir(output)
+
+    def check_file_exists(self, remote_cmd=''):
+        if self.direction == 'get':
+            return os.path.exists(self.dest_file)
+        files, _ = self._dir()
+        return self.dest_file in files
+
+    def remote_space_available(self, search_pattern=''):
+        _, free = self._dir()
+        if free is None:
+            raise ValueError("Unexpected output from 'dir', no 'Bytes Free'")
+        return free
+
+    def remote_file_size(self, remote_cmd='', remote_file=None):
+        if remote_file is None:
+            if self.direction == 'put':
+                remote_file = self.dest_file
+            else:
+                remote_file = self.source_file
+        files, _ = self._dir()
+        if remote_file not in files:
+            raise IOError("Unable to find file on remote system")
+        return files[remote_file]
+
+    def file_md5(self, file_name):
+        # called by __init__, the hash would never be compared
+        return None
+
+    def remote_md5(self, base_cmd='', remote_file=None):
+        raise NotImplementedError("DNOS6 cannot hash files")
+
+    def compare_size(self):
+        """Whether the remote and local files have the same size."""
+        if self.direction == 'put':
+            return self.remote_file_size() == self.file_size
+        return os.stat(self.dest_file).st_size == self.file_size
+
+    def compare_md5(self):
+        raise NotImplementedError("DNOS6 cannot hash files, use compare_size")
+
+    def verify_file(self):
+        return self.compare_size()
@@ -22,9 +22,13 @@ setup(
          'Programming Language :: Python',
          'Programming Language :: Python :: 2',
          'Programming Language :: Python :: 2.7',
+         'Programming Language :: Python :: 3',
          'Operating System :: POSIX :: Linux',
          'Operating System :: MacOS',
     ],
     include_package_data=True,
     install_requires=reqs,
+    extras_require={
+        'async': ['asyncssh'],
+    },
 )
@@ -0,0 +1,74 @@
+"""Tests of the asyncio driver on a fake channel."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import asyncio
+import sys
+
+import pytest
+
+# not collected before Python 3.5, see conftest.py
+pytest.importorskip('napalm')
+
+from napalm.base.exceptions import CommandErrorException  # noqa: E402
+
+from napalm_dell.dell_async import AsyncDNOS6Driver  # noqa: E402
+
+
+class FakeStreams(object):
+    """stdin and stdout of an SSH session answering from outputs."""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.queue = asyncio.Queue()
+
+    def write(self, data):
+        command = data.rstrip('\n')
+        output = self.outputs.get(command)
+        if output is not None:
+            self.queue.put_nowait('%s\r\n%s\r\nsw1#' % (command, output))
+
+    async def read(self, size):
+        return await self.queue.get()
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine) \
+        if sys.version_info < (3, 7) else asyncio.run(coroutine)
+
+
+async def send(outputs, command, timeout=1):
+    driver = AsyncDNOS6Driver('sw1', 'user', 'password', timeout=timeout,
+                              optional_args={'command_cache': True})
+    assert driver._lock is None
+    # what open() sets up after connecting
+    driver._lock = asyncio.Lock()
+    driver._stdin = driver._stdout = FakeStreams(outputs)
+    return await driver._send_command(command)
+
+
+def test_send_command():
+    assert run(send({'show version': 'line 1\r\nline 2'}, 'show version')) == \
+        'line 1\nline 2'
+
+
+def test_command_variants():
+    invalid = "% Invalid input detected at '^' marker."
+    outputs = {'show a': invalid, 'show b': 'b'}
+    assert run(send(outputs, ['show a', 'show b'])) == 'b'
+
+
+def test_timeout_raises_command_error():
+    with pytest.raises(CommandErrorException):
+        run(send({}, 'show version', timeout=0.05))
@@ -0,0 +1,98 @@
+"""Tests of the command output cache."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import pytest
+
+from napalm_dell import cache
+from napalm_dell.cache import CommandCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache, '_clock', lambda: now[0])
+    return now
+
+
+def test_ttl(clock):
+    commands = CommandCache(ttl=10)
+    commands.put('show version', 'v1')
+    clock[0] += 10
+    assert commands.get('show version') == 'v1'
+    clock[0] += 0.5
+    assert commands.get('show version') is None
+    # expired entries are dropped on access
+    assert len(commands) == 0
+
+
+def test_lru_eviction(clock):
+    commands = CommandCache(size=2)
+    commands.put('a', 'A')
+    commands.put('b', 'B')
+    assert commands.get('a') == 'A'
+    commands.put('c', 'C')
+    assert commands.get('b') is None
+    assert commands.get('a') == 'A'
+    assert commands.get('c') == 'C'
+
+
+def test_put_refreshes(clock):
+    commands = CommandCache(ttl=10)
+    commands.put('a', 'old')
+    clock[0] += 8
+    commands.put('a', 'new')
+    clock[0] += 8
+    assert commands.get('a') == 'new'
+
+
+class FakeDevice(object):
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.sent = []
+
+    def send_command(self, command, **kwargs):
+        self.sent.append(command)
+        return self.outputs[command].pop(0)
+
+
+def driver(outputs):
+    pytest.importorskip('napalm')
+    from napalm_dell.dell import DNOS6Driver
+    device = DNOS6Driver('sw1', 'user', 'password',
+                         optional_args={'command_cache': True})
+    device.device = FakeDevice(outputs)
+    return device
+
+
+def test_driver_cache_and_invalidation():
+    device = driver({'show version': ['v1', 'v2'], 'clear counters': ['']})
+    assert device._send_command('show version') == 'v1'
+    assert device._send_command('show version') == 'v1'
+    device._send_command('clear counters')
+    assert device._send_command('show version') == 'v2'
+
+
+def test_driver_does_not_cache_errors():
+    invalid = "                 ^\n% Invalid input detected at '^' marker.\n"
+    device = driver({'show lldp remote-device detail all': [invalid, 'ok'],
+                     'show hosts': [invalid, 'hosts']})
+    command = 'show lldp remote-device detail all'
+    assert device._send_command(command) == invalid
+    assert device._send_command(command) == 'ok'
+    assert device._send_commands(['show hosts']) == [invalid]
+    assert device._send_commands(['show hosts']) == ['hosts']
@@ -0,0 +1,68 @@
+"""Tests of the columnar CompactMacTable."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+from __future__ import unicode_literals
+
+from napalm_dell import parsers
+from napalm_dell.compact import CompactMacTable, int_to_mac, mac_to_int
+
+MAC_TABLE = '''
+Aging time is 300 Sec
+
+Vlan     Mac Address           Type        Port
+-------- --------------------- ----------- ---------------------
+1        0025.90C2.88ED        Dynamic     Gi1/0/48
+1        F48E.3841.9628        Management  Vl1
+10       0025.90C2.88EE        Dynamic     Gi1/0/2
+10       0025.90C2.88EF        Static      Gi1/0/48
+''' + ''.join('20       0000.0000.%04X        Dynamic     Gi1/0/%d\n' % (i, i % 4 + 1)
+              for i in range(13))
+
+
+def test_mac_conversion():
+    assert mac_to_int('F4:8E:38:41:96:28') == 0xF48E38419628
+    assert int_to_mac(0xF48E38419628) == 'F4:8E:38:41:96:28'
+    assert int_to_mac(mac_to_int('00:00:00:00:00:01')) == '00:00:00:00:00:01'
+
+
+def test_same_entries_as_the_parser():
+    table = CompactMacTable.from_output(MAC_TABLE)
+    assert len(table) == 17
+    assert list(table) == list(parsers.iter_mac_address_table(MAC_TABLE))
+    assert table[-1] == table[16]
+    # interfaces are stored once
+    assert table.interfaces.count('Gi1/0/48') == 1
+
+
+def test_round_trip():
+    table = CompactMacTable.from_output(MAC_TABLE)
+    copy = CompactMacTable.from_bytes(table.to_bytes())
+    assert list(copy) == list(table)
+    assert list(copy.filter(interface='Gi1/0/48')) == \
+        list(table.filter(interface='Gi1/0/48'))
+    empty = CompactMacTable.from_bytes(CompactMacTable().to_bytes())
+    assert len(empty) == 0 and empty.interfaces == []
+
+
+def test_filter():
+    table = CompactMacTable.from_output(MAC_TABLE)
+    uplink = table.filter(interface='Gi1/0/48')
+    assert [(e['vlan'], e['static']) for e in uplink] == [(1, False), (10, True)]
+    assert len(table.filter(vlan=20)) == 13
+    assert [e['mac'] for e in table.filter(vlan=10, interface='Gi1/0/2')] == \
+        ['00:25:90:C2:88:EE']
+    assert len(table.filter(interface='Gi1/0/9')) == 0
@@ -0,0 +1,169 @@
+"""Tests of the configuration merge, rollback and candidate transfer."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+from __future__ import unicode_literals
+
+import pytest
+
+pytest.importorskip('napalm')
+
+from napalm.base.exceptions import CommandErrorException  # noqa: E402
+from napalm.base.exceptions import ConnectionException  # noqa: E402
+from napalm.base.exceptions import MergeConfigException  # noqa: E402
+
+from napalm_dell import dell  # noqa: E402
+from napalm_dell.dell import DNOS6Driver  # noqa: E402
+
+MERGE = 'copy flash:/merge_config.txt running-config'
+
+
+class FakeDevice(object):
+
+    def __init__(self, outputs=None):
+        self.outputs = outputs or {}
+        self.sent = []
+        self.saved = False
+
+    def send_command(self, command, **kwargs):
+        self.sent.append(command)
+        return self.outputs.get(command, '')
+
+    def save_config(self):
+        self.saved = True
+
+    def set_base_prompt(self):
+        pass
+
+
+def driver(outputs=None, **optional_args):
+    optional_args.setdefault('dest_file_system', 'flash:')
+    device = DNOS6Driver('sw1', 'user', 'password',
+                         optional_args=optional_args)
+    device.device = FakeDevice(outputs)
+    return device
+
+
+def test_merge():
+    device = driver({MERGE: 'interface Gi1/0/1\ndescription "failed uplink"\n'})
+    device.commit_config()
+    assert device.device.sent == [
+        'copy running-config flash:/rollback_config.txt', MERGE]
+    assert device.device.saved
+
+
+@pytest.mark.parametrize('output', [
+    "% Invalid input detected at '^' marker.",
+    'Configuration script validation failed.',
+    'Execution of configuration script could not be completed.',
+    'Error: unable to apply line 3',
+])
+def test_merge_failed(output):
+    device = driver({MERGE: 'vlan 10\n' + output + '\n'})
+    with pytest.raises(MergeConfigException):
+        device.commit_config()
+    assert not device.device.saved
+
+
+def test_merge_failed_rollback():
+    rollback = 'copy flash:/rollback_config.txt running-config'
+    device = driver({MERGE: '% Incomplete command.\n'})
+    with pytest.raises(MergeConfigException) as excinfo:
+        device.commit_config()
+    assert 'Rollback done' in str(excinfo.value)
+    assert device.device.sent[-1] == rollback
+
+    device = driver({MERGE: '% Incomplete command.\n'},
+                    auto_rollback_on_error=False)
+    with pytest.raises(MergeConfigException):
+        device.commit_config()
+    assert rollback not in device.device.sent
+
+
+def test_rollback():
+    device = driver()
+    device.rollback()
+    assert device.device.sent == [
+        'copy flash:/rollback_config.txt running-config']
+    assert device.device.saved
+
+    device = driver({'copy flash:/rollback_config.txt running-config':
+                     'Configuration script validation failed.\n'})
+    with pytest.raises(CommandErrorException):
+        device.rollback()
+    assert not device.device.saved
+
+
+def test_inline_transfer_rejected():
+    with pytest.raises(ConnectionException):
+        driver(inline_transfer=True)
+
+
+def test_load_over_telnet_rejected():
+    device = driver(transport='telnet')
+    with pytest.raises(ConnectionException):
+        device.load_merge_candidate(config='hostname sw1\n')
+    assert device._candidate_file is None
+    assert device.device.sent == []
+
+
+class FakeTransfer(object):
+
+    transfers = []
+
+    def __init__(self, device, source_file, dest_file, file_system, direction):
+        self.transfers.append((dest_file, file_system))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def verify_space_available(self):
+        return True
+
+    def transfer_file(self):
+        pass
+
+    def verify_file(self):
+        return True
+
+
+def test_load_without_dest_file_system(tmpdir, monkeypatch):
+    tmpdir.join('dir.txt').write(
+        'Attr   Size      Date                       Name\n'
+        '-rwx   11408     Feb 22 2016 10:46:06        startup-config\n'
+        '\n'
+        'Bytes Free: 911187968\n')
+    monkeypatch.setattr(dell, 'DNOS6FileTransfer', FakeTransfer)
+    device = DNOS6Driver('sw1', 'user', 'password', optional_args={
+        'transport': 'replay', 'replay_dir': str(tmpdir)})
+    device.open()
+    device.load_merge_candidate(config='hostname sw1\n')
+    assert FakeTransfer.transfers == [('merge_config.txt', 'flash:')]
+    assert device.dest_file_system == 'flash:'
+    device.discard_config()
+    device.close()
+
+
+def test_unknown_file_system(tmpdir):
+    device = DNOS6Driver('sw1', 'user', 'password', optional_args={
+        'transport': 'replay', 'replay_dir': str(tmpdir)})
+    device.open()
+    with pytest.raises(CommandErrorException):
+        device.load_merge_candidate(config='hostname sw1\n')
+    device.close()
@@ -0,0 +1,120 @@
+"""Tests of the MAC and ARP table trackers behind the get_*_delta getters."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+from __future__ import unicode_literals
+
+import pytest
+
+from napalm_dell import parsers
+from napalm_dell.delta import ArpTableTracker, MacTableTracker
+
+MAC_TABLE = '''
+Aging time is 300 Sec
+
+Vlan     Mac Address           Type        Port
+-------- --------------------- ----------- ---------------------
+1        0025.90C2.88ED        Dynamic     Gi1/0/48
+1        F48E.3841.9628        Management  Vl1
+10       0025.90C2.88EE        Dynamic     Gi1/0/2
+'''
+
+ARP_TABLE = '''
+IP Address      MAC Address        Interface  Type      Age
+--------------- ------------------ ---------- --------- -----------
+10.0.0.1        0025.90C2.88ED     Vl1        Dynamic   0h 1m 5s
+10.0.0.2        0025.90C2.88EE     Vl1        Dynamic   0h 0m 7s
+'''
+
+
+def mac_table(output=MAC_TABLE):
+    return list(parsers.iter_mac_address_table(output))
+
+
+def test_mac_first_update_adds_everything():
+    tracker = MacTableTracker()
+    delta = tracker.update(mac_table())
+    assert len(delta['added']) == 3
+    assert delta['removed'] == [] and delta['moved'] == []
+    assert all(e['moves'] == 0 for e in delta['added'])
+    assert tracker.update(mac_table()) == \
+        {'added': [], 'removed': [], 'moved': []}
+
+
+def test_mac_moves_and_removals():
+    tracker = MacTableTracker()
+    tracker.update(mac_table(), now=100.0)
+    moved = MAC_TABLE.replace('Gi1/0/48', 'Gi1/0/47')
+    moved = '\n'.join(l for l in moved.splitlines() if 'Gi1/0/2' not in l)
+    delta = tracker.update(mac_table(moved), now=200.0)
+    assert delta['added'] == []
+    assert [(e['vlan'], e['interface']) for e in delta['removed']] == \
+        [(10, 'Gi1/0/2')]
+    entry, = delta['moved']
+    assert entry['interface'] == 'Gi1/0/47'
+    assert entry['previous_interface'] == 'Gi1/0/48'
+    assert (entry['moves'], entry['last_move']) == (1, 200.0)
+    # later polls keep the move count of the entry
+    entries = mac_table(moved)
+    annotated = list(tracker.annotate(entries))
+    assert [(e['moves'], e['last_move']) for e in annotated
+            if e['interface'] == 'Gi1/0/47'] == [(1, 200.0)]
+
+
+def test_mac_flag_change_is_not_a_move():
+    tracker = MacTableTracker()
+    tracker.update(mac_table())
+    delta = tracker.update(mac_table(MAC_TABLE.replace('Dynamic ', 'Static  ')))
+    assert delta['moved'] == []
+
+
+def test_arp_changed_mac():
+    tracker = ArpTableTracker()
+    tracker.update(list(parsers.iter_arp_table(ARP_TABLE)))
+    changed = ARP_TABLE.replace('0025.90C2.88EE', '0025.90C2.88EF')
+    delta = tracker.update(list(parsers.iter_arp_table(changed)))
+    entry, = delta['moved']
+    assert entry['ip'] == '10.0.0.2'
+    assert entry['previous_mac'] == '00:25:90:C2:88:EE'
+    assert entry['previous_interface'] == 'Vl1'
+
+
+class FakeDevice(object):
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+
+    def send_command(self, command, **kwargs):
+        return self.outputs[command]
+
+
+def test_plain_getters_do_not_consume_deltas():
+    pytest.importorskip('napalm')
+    from napalm_dell.dell import DNOS6Driver
+    driver = DNOS6Driver('sw1', 'user', 'password')
+    outputs = {'show mac address-table': MAC_TABLE, 'show arp': ARP_TABLE}
+    driver.device = FakeDevice(outputs)
+    driver.get_mac_address_table_delta()
+    driver.get_arp_table_delta()
+    outputs['show mac address-table'] = MAC_TABLE.replace('Gi1/0/48', 'Gi1/0/47')
+    outputs['show arp'] = ARP_TABLE.replace('10.0.0.2', '10.0.0.3')
+    driver.get_mac_address_table()
+    driver.get_arp_table()
+    mac_delta = driver.get_mac_address_table_delta()
+    assert [e['previous_interface'] for e in mac_delta['moved']] == ['Gi1/0/48']
+    arp_delta = driver.get_arp_table_delta()
+    assert [e['ip'] for e in arp_delta['added']] == ['10.0.0.3']
+    assert [e['ip'] for e in arp_delta['removed']] == ['10.0.0.2']
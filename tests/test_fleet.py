@@ -0,0 +1,105 @@
+"""Tests of the fleet runner with a fake driver."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import threading
+
+import pytest
+
+pytest.importorskip('napalm')
+
+from napalm.base.exceptions import ConnectionClosedException  # noqa: E402
+
+from napalm_dell.fleet import DeviceResult, FleetRunner  # noqa: E402
+
+
+class FakeDriver(object):
+    """Driver whose getters answer from class attributes."""
+
+    opened = []
+    release = threading.Event()
+
+    def __init__(self, hostname, username, password, timeout=60,
+                 optional_args=None):
+        self.hostname = hostname
+        self.alive = True
+
+    def open(self):
+        if self.hostname == 'down':
+            raise ConnectionClosedException('no route to host')
+        self.opened.append(self.hostname)
+
+    def close(self):
+        self.alive = False
+
+    def is_alive(self):
+        return {'is_alive': self.alive}
+
+    def get_facts(self):
+        if self.hostname == 'slow':
+            self.release.wait(5)
+        return {'hostname': self.hostname}
+
+    def get_lost(self):
+        raise ConnectionClosedException('gone')
+
+
+@pytest.fixture
+def fleet():
+    FakeDriver.opened = []
+    FakeDriver.release = threading.Event()
+    hosts = ['sw1', 'sw2', 'slow', 'down']
+    inventory = [{'hostname': h, 'username': 'u', 'password': 'p'} for h in hosts]
+    runner = FleetRunner(inventory, max_workers=4, device_timeout=0.2,
+                         driver=FakeDriver)
+    yield runner
+    FakeDriver.release.set()
+    runner.close()
+
+
+def test_results_errors_and_timeout(fleet):
+    results = dict((r.hostname, r) for r in fleet.run(['get_facts']))
+    assert results['sw1'].results == {'get_facts': {'hostname': 'sw1'}}
+    assert 'open' in results['down'].errors
+    assert list(results['slow'].errors) == ['timeout']
+    assert results['slow'].elapsed >= 0.2
+
+
+def test_sessions_reused(fleet):
+    list(fleet.run(['get_facts'], ['sw1']))
+    list(fleet.run(['get_facts'], ['sw1']))
+    assert FakeDriver.opened == ['sw1']
+
+
+def test_session_error_discards_session(fleet):
+    result, = fleet.run(['get_lost', 'get_facts'], ['sw1'])
+    # the getters after a session error are not run
+    assert list(result.errors) == ['get_lost'] and not result.results
+    list(fleet.run(['get_facts'], ['sw1']))
+    assert FakeDriver.opened == ['sw1', 'sw1']
+
+
+def test_busy_device(fleet):
+    list(fleet.run(['get_facts'], ['slow']))
+    # the abandoned worker is still running
+    result, = fleet.run(['get_facts'], ['slow'])
+    assert 'open' in result.errors
+
+
+def test_device_result_is_a_tuple():
+    result = DeviceResult('sw1', {}, {}, 0.5)
+    assert result.hostname == 'sw1' and tuple(result) == ('sw1', {}, {}, 0.5)
+    assert 'FleetRunner' in DeviceResult.__doc__
@@ -0,0 +1,129 @@
+"""Tests of the LLDP neighbor detail parsing and its bulk retrieval."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import pytest
+
+from napalm_dell import parsers
+
+DETAIL_ALL = '''
+Local Interface: Gi1/0/1
+
+Remote Identifier: 2
+Chassis ID Subtype: MAC Address
+Chassis ID: 00:FC:E3:90:01:0F
+Port ID Subtype: Interface Name
+Port ID: Gi1/0/48
+System Name: core1
+System Description: Dell Networking N2048P, 6.2.7.2
+Port Description: uplink
+System Capabilities Supported: bridge, router
+System Capabilities Enabled: bridge
+Time to Live: 24 seconds
+
+Local Interface: Gi1/0/2
+
+Remote Identifier: 3
+Chassis ID Subtype: MAC Address
+Chassis ID: 00:FC:E3:90:01:10
+Port ID: 00:FC:E3:90:01:11
+System Name:
+System Capabilities Supported: WLAN access point, station only
+System Capabilities Enabled:
+Remote Identifier: 4
+Chassis ID Subtype: MAC Address
+Chassis ID: 00:FC:E3:90:01:12
+Port ID: x
+'''
+
+NEIGHBORS = '''
+   Local
+Interface RemID   Chassis ID          Port ID           System Name
+--------- ------- ------------------- ----------------- -----------------
+Gi1/0/1   2       00:FC:E3:90:01:0F   Gi1/0/48          core1
+'''
+
+
+def test_neighbor_detail():
+    detail = parsers.parse_lldp_neighbor_detail(DETAIL_ALL)
+    assert sorted(detail) == ['Gi1/0/1', 'Gi1/0/2']
+    assert detail['Gi1/0/1'] == [{
+        'parent_interface': '',
+        'remote_chassis_id': '00:FC:E3:90:01:0F',
+        'remote_system_name': 'core1',
+        'remote_port': 'Gi1/0/48',
+        'remote_port_description': 'uplink',
+        'remote_system_description': 'Dell Networking N2048P, 6.2.7.2',
+        'remote_system_capab': ['bridge', 'router'],
+        'remote_system_enable_capab': ['bridge'],
+    }]
+    # a repeated label starts the next neighbor of the same interface
+    second = detail['Gi1/0/2']
+    assert [n['remote_chassis_id'] for n in second] == \
+        ['00:FC:E3:90:01:10', '00:FC:E3:90:01:12']
+    assert second[0]['remote_system_capab'] == ['wlan-access-point', 'station']
+    assert second[0]['remote_system_enable_capab'] == []
+
+
+def test_neighbor_detail_without_local_interface():
+    output = DETAIL_ALL.split('Local Interface: Gi1/0/2')[0]
+    output = output.replace('Local Interface: Gi1/0/1\n', '')
+    detail = parsers.parse_lldp_neighbor_detail(output, 'Gi1/0/1')
+    assert list(detail) == ['Gi1/0/1']
+
+
+class FakeDevice(object):
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.sent = []
+
+    def send_command(self, command, **kwargs):
+        self.sent.append(command)
+        return self.outputs[command]
+
+
+def driver(outputs):
+    pytest.importorskip('napalm')
+    from napalm_dell.dell import DNOS6Driver
+    device = DNOS6Driver('sw1', 'user', 'password',
+                         optional_args={'canonical_int': True})
+    device.device = FakeDevice(outputs)
+    return device
+
+
+def test_bulk_detail_in_one_command():
+    device = driver({'show lldp remote-device detail all': DETAIL_ALL})
+    detail = device.get_lldp_neighbor_detail()
+    assert sorted(detail) == ['GigabitEthernet1/0/1', 'GigabitEthernet1/0/2']
+    assert device.device.sent == ['show lldp remote-device detail all']
+
+
+def test_bulk_detail_fallback():
+    invalid = "% Invalid input detected at '^' marker."
+    device = driver({
+        'show lldp remote-device detail all': invalid,
+        'show lldp remote-device all': NEIGHBORS,
+        'show lldp remote-device detail Gi1/0/1':
+            DETAIL_ALL.split('Local Interface: Gi1/0/2')[0],
+    })
+    detail = device.get_lldp_neighbor_detail()
+    assert list(detail) == ['GigabitEthernet1/0/1']
+    assert len(detail['GigabitEthernet1/0/1']) == 1
+    # the unsupported bulk command is not tried again
+    device.device.sent = []
+    device.get_lldp_neighbor_detail()
+    assert 'show lldp remote-device detail all' not in device.device.sent
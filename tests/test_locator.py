@@ -0,0 +1,109 @@
+"""Tests of the Locator indexes and its location ranking."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+from __future__ import unicode_literals
+
+from napalm_dell.locator import Location, Locator
+
+HOST = '00:25:90:C2:88:ED'
+
+
+def mac(interface, vlan=1, address=HOST):
+    return {'mac': address, 'interface': interface, 'vlan': vlan,
+            'static': False, 'active': True, 'moves': -1, 'last_move': -1.0}
+
+
+def arp(ip, address=HOST):
+    return {'interface': 'Vl1', 'mac': address, 'ip': ip, 'age': 5.0}
+
+
+def locator():
+    locator = Locator()
+    # core1 learns the host on its uplink to sw2, sw2 on an edge port
+    locator.update_device('core1', mac_table=[mac('Gi1/0/48')],
+                          arp_table=[arp('10.0.3.17')],
+                          lldp_neighbors={'Gi1/0/48': []})
+    locator.update_device('sw2', mac_table=[mac('GigabitEthernet1/0/12')],
+                          lldp_neighbors={'Gi1/0/1': []})
+    return locator
+
+
+def test_edge_port_preferred():
+    expected = Location(HOST, 'sw2', 'GigabitEthernet1/0/12', 1, True)
+    index = locator()
+    assert index.locate('10.0.3.17') == expected
+    for notation in ('0025.90C2.88ED', '00-25-90-c2-88-ed', '002590c288ed'):
+        assert index.locate(notation) == expected
+    assert [l.hostname for l in index.locations(HOST)] == ['sw2', 'core1']
+    assert index.locate('10.0.3.18') is None
+
+
+def test_lldp_change_reranks():
+    index = locator()
+    # the port of sw2 turns out to be an uplink too, with the short name
+    index.update_device('sw2', lldp_neighbors={'Gi1/0/12': []})
+    assert index.locate(HOST).hostname == 'core1'
+    assert not any(l.edge for l in index.locations(HOST))
+
+
+def test_vlans_are_separate_entries():
+    index = Locator()
+    index.update_device('sw1', mac_table=[mac('Gi1/0/5', vlan=10),
+                                          mac('Gi1/0/6', vlan=20)])
+    assert [(l.vlan, l.interface) for l in index.locations(HOST)] == \
+        [(10, 'Gi1/0/5'), (20, 'Gi1/0/6')]
+    index.update_device('sw1', mac_table=[mac('Gi1/0/6', vlan=20)])
+    assert index.locate(HOST).vlan == 20
+    assert len(index) == 1
+
+
+def test_remove_device():
+    index = locator()
+    index.remove_device('sw2')
+    assert index.locate(HOST).hostname == 'core1'
+    index.remove_device('core1')
+    assert index.locate(HOST) is None
+    assert index.locate('10.0.3.17') is None
+    assert len(index) == 0
+
+
+class FakeFleet(object):
+
+    def __init__(self, results):
+        self.results = results
+
+    def run(self, getters, hostnames=None):
+        return self.results
+
+
+class FakeResult(object):
+
+    def __init__(self, hostname, results, errors=None):
+        self.hostname = hostname
+        self.results = results
+        self.errors = errors or {}
+
+
+def test_refresh_keeps_tables_on_errors():
+    index = locator()
+    error = IOError('timeout')
+    failed = index.refresh(FakeFleet([
+        FakeResult('sw2', {'get_lldp_neighbors': {'Gi1/0/1': []}},
+                   {'get_mac_address_table': error}),
+    ]))
+    assert failed == {'sw2': {'get_mac_address_table': error}}
+    assert index.locate(HOST).hostname == 'sw2'
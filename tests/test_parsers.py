@@ -0,0 +1,173 @@
+"""Tests of the output parsers against the captures in example_output."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import io
+import os
+
+import pytest
+
+from napalm_dell import parsers
+
+EXAMPLE_OUTPUT = os.path.join(os.path.dirname(parsers.__file__), 'example_output')
+
+
+def example(name):
+    with io.open(os.path.join(EXAMPLE_OUTPUT, name), 'rt', encoding='utf-8') as fobj:
+        return fobj.read()
+
+
+def test_table_layout_split():
+    layout = parsers.TableLayout('-------- ------------ ----')
+    assert layout.starts == [0, 9, 22]
+    assert layout.split('Gi1/0/1  office1      Up') == ['Gi1/0/1', 'office1', 'Up']
+    # short row
+    assert layout.split('Gi1/0/1') == ['Gi1/0/1', '', '']
+    # a value running into the next column
+    assert layout.split('Gi1/0/1  office1.example.com Up') == \
+        ['Gi1/0/1', 'office1.example.com', 'Up']
+
+
+def test_table_layout_wrapped_header():
+    layout = parsers.TableLayout('------- ------------------------------ ----- -----')
+    header = layout.header([
+        'Port    Description                    MTU   Admin',
+        'Channel                                      State',
+    ])
+    assert header == ('Port Channel', 'Description', 'MTU', 'Admin State')
+
+
+def test_iter_table_rows_several_tables():
+    rows = list(parsers.iter_table_rows(example('show_interfaces_status.txt')))
+    headers = set(header for header, _ in rows)
+    assert len(headers) == 2
+    # the capture starts in the middle of the first header word
+    header, values = rows[0]
+    assert header[1:] == ('Description', 'Duplex', 'Speed', 'Neg', 'MTU',
+                          'Admin State')
+    assert values == ['Gi1/0/1', 'idrac6.vmhost1', 'Full', '100', 'Auto',
+                      '1518', 'Up']
+    assert rows[-1] == (('Port Channel', 'Description', 'MTU', 'Admin State'),
+                        ['Po128', '', '1518', 'Up'])
+
+
+def test_iter_table_rows_stops_at_total():
+    output = example('show_mac_address-list.txt')
+    rows = list(parsers.iter_table_rows(output))
+    assert len(rows) == 51
+    assert all(len(values) == 4 for _, values in rows)
+
+
+def test_mac_address_table():
+    table = list(parsers.iter_mac_address_table(
+        example('show_mac_address-list.txt'),
+        parsers.InterfaceNames().__getitem__))
+    assert len(table) == 51
+    assert table[0] == {
+        'mac': '00:25:90:C2:88:ED',
+        'interface': 'GigabitEthernet1/0/48',
+        'vlan': 1,
+        'static': False,
+        'active': True,
+        'moves': -1,
+        'last_move': -1.0,
+    }
+    assert table[-1]['vlan'] == 52
+
+
+def test_interfaces_status():
+    ifaces = parsers.parse_interfaces_status(
+        example('show_interfaces_status.txt'), 'F48E.3841.9628')
+    assert len(ifaces) == 278
+    assert ifaces[0] == {'Gi1/0/1': {
+        'is_up': True,
+        'is_enable': True,
+        'description': 'idrac6.vmhost1',
+        'last_flapped': -1,
+        'speed': 100,
+        'mac_address': 'F4:8E:38:41:96:28',
+    }}
+    gi6 = ifaces[5]['Gi1/0/6']
+    assert not gi6['is_up'] and gi6['speed'] == 0
+    # port-channel rows have no speed or link column
+    assert not ifaces[-1]['Po128']['is_up']
+
+
+def test_build_interfaces():
+    config = parsers.parse_interface_config(
+        'interface Gi2/0/22\ndescription "office1"\nshutdown\nexit\n')
+    ifaces = parsers.build_interfaces(config, example('show_interfaces.txt'))
+    assert len(ifaces) == 10
+    assert ifaces[0] == {'Gi2/0/22': {
+        'is_up': False,
+        'is_enable': False,
+        'description': 'office1',
+        'last_flapped': -1,
+        'speed': 0,
+        'mac_address': 'F4:8E:38:41:96:28',
+    }}
+    assert ifaces[1]['Gi2/0/23']['is_enable']
+
+
+def test_facts():
+    facts = parsers.parse_facts(example('show_version.txt'),
+                                'System Name: sw1\n'
+                                'System Up Time: 1 days, 0h:0m:5s\n',
+                                'Host name: sw1\nDefault domain: example.org\n',
+                                example('show_interfaces_status.txt'))
+    assert facts['model'] == 'N2048P'
+    assert facts['os_version'] == '6.2.7.2'
+    assert facts['uptime'] == 86405.0
+    assert facts['fqdn'] == 'sw1.example.org'
+    assert len(facts['interface_list']) == 278
+
+
+def test_lldp_neighbors():
+    output = (
+        '   Local\n'
+        'Interface RemID   Chassis ID          Port ID           System Name\n'
+        '--------- ------- ------------------- ----------------- -----------------\n'
+        'Gi1/0/1   2       00:1E:C9:DE:B4:A5   Gi1/0/48          switch2\n'
+        'Te1/0/1   3       00:1E:C9:DE:B4:A6   Te1/0/2\n')
+    neighbors = parsers.parse_lldp_neighbors(
+        output, parsers.InterfaceNames().__getitem__)
+    assert neighbors == {
+        'GigabitEthernet1/0/1': [{'hostname': 'switch2', 'port': 'Gi1/0/48'}],
+        'TenGigabitEthernet1/0/1': [{'hostname': None, 'port': 'Te1/0/2'}],
+    }
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Gi1/0/1', 'GigabitEthernet1/0/1'),
+    ('Te1/0/1', 'TenGigabitEthernet1/0/1'),
+    ('Po 12', 'Port-channel12'),
+    ('Vl100', 'Vlan100'),
+])
+def test_canonical_interface(name, expected):
+    assert parsers.canonical_dnos6_interface(name) == expected
+
+
+def test_dir():
+    files, free = parsers.parse_dir(
+        'Attr   Size      Date                       Name\n'
+        'drwx   2048      Jan 07 2016 13:35:26        log\n'
+        '-rwx   11408     Feb 22 2016 10:46:06        startup-config\n'
+        '\n'
+        'Total Size: 1043984384\n'
+        'Bytes Used: 132796416\n'
+        'Bytes Free: 911187968\n')
+    assert files == {'startup-config': 11408}
+    assert free == 911187968
@@ -0,0 +1,109 @@
+"""Tests of the prompt-driven reads of the driver on a fake channel."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import pytest
+
+pytest.importorskip('napalm')
+
+from napalm.base.exceptions import CommandErrorException  # noqa: E402
+
+from napalm_dell.dell import DNOS6Driver  # noqa: E402
+
+
+class FakeChannel(object):
+    """Answers the commands written to it, read_size characters per read."""
+
+    base_prompt = 'sw1'
+    RETURN = '\n'
+
+    def __init__(self, outputs, read_size=7, prompt='sw1#'):
+        self.outputs = outputs
+        self.read_size = read_size
+        self.prompt = prompt
+        self.pending = ''
+        self.written = []
+
+    def clear_buffer(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def write_channel(self, data):
+        self.written.append(data)
+        for command in data.split(self.RETURN)[:-1]:
+            output = self.outputs.get(command)
+            if output is None:
+                continue
+            self.pending += '%s\r\n%s\r\n%s' % (command, output, self.prompt)
+
+    def read_channel(self):
+        data = self.pending[:self.read_size]
+        self.pending = self.pending[self.read_size:]
+        return data
+
+
+def driver(channel, **optional_args):
+    optional_args.setdefault('pipeline_commands', True)
+    device = DNOS6Driver('sw1', 'user', 'password', timeout=1,
+                         optional_args=optional_args)
+    device.device = channel
+    return device
+
+
+@pytest.mark.parametrize('read_size', [1, 2, 3, 7, 4096])
+def test_pipelined_split(read_size):
+    channel = FakeChannel({
+        'show a': 'line a1\r\nsw1 is not a prompt here: sw1#\r\nsw1',
+        'show b': 'line b',
+        'show c': '',
+    }, read_size)
+    device = driver(channel)
+    outputs = device._send_commands(['show a', 'show b', 'show c'])
+    assert channel.written == ['show a\nshow b\nshow c\n']
+    assert outputs == ['line a1\nsw1 is not a prompt here: sw1#\nsw1',
+                       'line b', '']
+
+
+def test_pipelined_config_mode():
+    channel = FakeChannel({'show a': 'line a', 'show b': 'line b'},
+                          prompt='sw1(config-if-Gi1/0/1)#')
+    device = driver(channel)
+    assert device._send_commands(['show a', 'show b']) == ['line a', 'line b']
+
+
+def test_pipelined_large_output():
+    body = ('x' * 70 + '\r\n') * 20000
+    channel = FakeChannel({'show a': body, 'show b': body}, 4096)
+    device = driver(channel)
+    outputs = device._send_commands(['show a', 'show b'])
+    assert outputs == [body.replace('\r', '').rstrip('\n')] * 2
+
+
+def test_adaptive_single_read():
+    channel = FakeChannel({'show a': 'line a'})
+    device = driver(channel, pipeline_commands=False, adaptive_reads=True)
+    assert device._read_command(channel, 'show a') == 'line a'
+    assert device.rtt is not None
+
+
+def test_silent_channel_times_out():
+    channel = FakeChannel({})
+    device = driver(channel)
+    device.rtt = 0.001
+    with pytest.raises(CommandErrorException):
+        device._send_commands(['show a', 'show b'])
@@ -0,0 +1,110 @@
+"""Tests of the running-config reuse behind config_change_command."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+from __future__ import unicode_literals
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('napalm')
+
+from napalm_dell.dell import DNOS6Driver  # noqa: E402
+from napalm_dell.pool import SessionPool  # noqa: E402
+
+CONFIG = '''!
+interface Gi1/0/1
+description "office1"
+shutdown
+exit
+'''
+
+
+class FakeDevice(object):
+
+    def __init__(self, fetches=None):
+        self.counter = '1'
+        self._fetches = fetches if fetches is not None else [0]
+
+    @property
+    def fetches(self):
+        return self._fetches[0]
+
+    def send_command(self, command, **kwargs):
+        if command == 'show config-counter':
+            return self.counter
+        assert command == 'show running-config'
+        self._fetches[0] += 1
+        time.sleep(0.01)
+        return CONFIG
+
+
+def driver(sessions=1):
+    device = DNOS6Driver('sw1', 'user', 'password', optional_args={
+        'config_change_command': 'show config-counter'})
+    device.device = FakeDevice()
+    if sessions > 1:
+        fetches = device.device._fetches
+        device._pool = SessionPool(
+            [device.device] + [FakeDevice(fetches) for _ in range(sessions - 1)])
+    return device
+
+
+def test_fetched_once_per_change():
+    device = driver()
+    assert device.get_config(retrieve='running')['running'] == CONFIG
+    device.get_config(retrieve='running')
+    assert device.device.fetches == 1
+    device.device.counter = '2'
+    device.get_config(retrieve='running')
+    assert device.device.fetches == 2
+    device.clear_cache()
+    device.get_config(retrieve='running')
+    assert device.device.fetches == 3
+
+
+def test_concurrent_callers_share_a_fetch():
+    device = driver(sessions=4)
+    results = []
+
+    def run():
+        results.append(device.get_config(retrieve='running')['running'])
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [CONFIG] * 4
+    assert device.device.fetches == 1
+
+
+def test_cleared_during_fetch_is_not_stored():
+    device = driver()
+    fetch = device.device.send_command
+
+    def send_command(command, **kwargs):
+        output = fetch(command, **kwargs)
+        if command == 'show running-config':
+            # e.g. a commit on another session
+            device.clear_cache()
+        return output
+
+    device.device.send_command = send_command
+    device.get_config(retrieve='running')
+    assert device._config_state is None
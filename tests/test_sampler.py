@@ -0,0 +1,99 @@
+"""Tests of the environment sampler and its ring buffers."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+from __future__ import unicode_literals
+
+import math
+
+from napalm_dell.sampler import EnvironmentSampler, RingBuffer
+
+CPU = '''
+Memory Utilization Report
+
+status      bytes
+------ ----------
+  free  170642152
+ alloc  839049216
+
+Total CPU Utilization    9.26%    9.75%    9.72%
+'''
+
+TEMPERATURE = '''
+Unit     Description       Temperature    Status
+                            (Celsius)
+----     -----------       -----------    ------
+1        MAC               47             Good
+1        PHY               52             Good
+'''
+
+EMPTY_TEMPERATURE = '''
+Unit     Description       Temperature    Status
+                            (Celsius)
+----     -----------       -----------    ------
+'''
+
+
+def test_ring_buffer():
+    ring = RingBuffer(3)
+    assert (ring.min(), ring.max(), ring.avg(), ring.last()) == \
+        (None, None, None, None)
+    for value in (1.0, 2.0, 3.0, 4.0):
+        ring.append(value)
+    assert len(ring) == 3
+    assert list(ring.values()) == [2.0, 3.0, 4.0]
+    assert (ring.min(), ring.max(), ring.avg(), ring.last()) == \
+        (2.0, 4.0, 3.0, 4.0)
+
+
+def test_ring_buffer_missing_values():
+    ring = RingBuffer(3)
+    ring.append(float('nan'))
+    assert (ring.min(), ring.max(), ring.avg()) == (None, None, None)
+    ring.append(2.0)
+    ring.append(4.0)
+    assert (ring.min(), ring.max(), ring.avg()) == (2.0, 4.0, 3.0)
+    # the NaN drops out of the buffer
+    ring.append(6.0)
+    assert ring.missing == 0
+    assert (ring.min(), ring.max(), ring.avg()) == (2.0, 6.0, 4.0)
+
+
+class FakeDriver(object):
+
+    def __init__(self, temperature):
+        self.temperature = temperature
+
+    def _send_commands(self, commands, use_cache=True):
+        assert not use_cache
+        return [CPU, self.temperature]
+
+
+def test_sample():
+    driver = FakeDriver(TEMPERATURE)
+    sampler = EnvironmentSampler(driver, size=10)
+    sampler.sample()
+    driver.temperature = EMPTY_TEMPERATURE
+    sampler.sample()
+    assert len(sampler) == 2
+    temperature = sampler.series['temperature']
+    assert temperature.values()[0] == 52.0
+    assert math.isnan(temperature.last())
+    summary = sampler.summary()
+    assert summary['temperature'] == \
+        {'count': 1, 'min': 52.0, 'max': 52.0, 'avg': 52.0}
+    assert summary['cpu']['count'] == 2
+    assert summary['available_ram']['max'] == 839049216 + 170642152
@@ -0,0 +1,112 @@
+"""Tests of the command and getter statistics."""
+# Copyright 2018 Daniel Molkentin. All rights reserved.
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from __future__ import unicode_literals
+
+import threading
+
+import pytest
+
+from napalm_dell import stats
+from napalm_dell.stats import Histogram, Stats, instrumented
+
+
+def test_histogram():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.add(value)
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == [(1, 2), (10, 1), (float('inf'), 1)]
+    assert (snapshot['count'], snapshot['min'], snapshot['max']) == (4, 0.5, 50)
+    assert snapshot['mean'] == 56.5 / 4
+
+
+def test_concurrent_records():
+    collected = Stats()
+
+    def record():
+        for _ in range(2000):
+            collected.record_command('show version', 0.001, 100)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    entry = collected.snapshot()['commands']['show version']
+    assert entry['seconds']['count'] == 16000
+    assert entry['bytes']['sum'] == 1600000
+
+
+class Getter(object):
+
+    def __init__(self, clock):
+        self._stats = Stats()
+        self.clock = clock
+
+    @instrumented
+    def get_outer(self):
+        self.clock[0] += 1.0
+        self._stats.record_command('show a', 2.0, 10)
+        self.clock[0] += 2.0
+        return self.get_inner()
+
+    @instrumented
+    def get_inner(self):
+        self._stats.record_command('show b', 4.0, 10)
+        self.clock[0] += 4.0
+        self.clock[0] += 0.5
+        return 'done'
+
+
+def test_parse_time(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(stats, '_clock', lambda: clock[0])
+    driver = Getter(clock)
+
+    # commands of another thread during the getter do not count
+    def busy():
+        driver._stats.record_command('show other', 100.0, 10)
+    thread = threading.Thread(target=busy)
+    thread.start()
+    thread.join()
+
+    assert driver.get_outer() == 'done'
+    getters = driver._stats.snapshot()['getters']
+    assert getters['get_inner']['parse_seconds']['sum'] == 0.5
+    assert getters['get_inner']['seconds']['sum'] == 4.5
+    assert getters['get_outer']['parse_seconds']['sum'] == 1.5
+    assert getters['get_outer']['seconds']['sum'] == 7.5
+
+
+def test_driver_records_each_command():
+    pytest.importorskip('napalm')
+    from napalm_dell.dell import DNOS6Driver
+
+    class FakeDevice(object):
+        def send_command(self, command, **kwargs):
+            return 'output of %s' % command
+
+    driver = DNOS6Driver('sw1', 'user', 'password',
+                         optional_args={'collect_stats': True,
+                                        'command_cache': True})
+    driver.device = FakeDevice()
+    driver._send_commands(['show a', 'show b'])
+    driver._send_commands(['show a', 'show c'])
+    commands = driver.get_stats()['commands']
+    assert sorted(commands) == ['show a', 'show b', 'show c']
+    assert commands['show a']['seconds']['count'] == 2
+    assert commands['show a']['cached'] == 1
+    assert commands['show c']['cached'] == 0